@@ -0,0 +1,50 @@
+"""add_search_indexes
+
+Revision ID: 3c1f9a2b7d4e
+Revises: e63d32474c06
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3c1f9a2b7d4e"
+down_revision: str | Sequence[str] | None = "e63d32474c06"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add GIN full-text indexes for item and location search (PostgreSQL only)."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.create_index(
+        "ix_items_search",
+        "items",
+        [
+            sa.text(
+                "to_tsvector('english', name || ' ' || coalesce(description, '')"
+                " || ' ' || coalesce(upc, ''))"
+            )
+        ],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_locations_search",
+        "locations",
+        [sa.text("to_tsvector('english', name || ' ' || coalesce(description, ''))")],
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Drop the full-text search indexes."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_locations_search", table_name="locations")
+    op.drop_index("ix_items_search", table_name="items")
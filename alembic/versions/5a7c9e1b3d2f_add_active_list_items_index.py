@@ -0,0 +1,35 @@
+"""add_active_list_items_index
+
+Revision ID: 5a7c9e1b3d2f
+Revises: 8e2d4b6a1c3f
+Create Date: 2026-10-15 14:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "5a7c9e1b3d2f"
+down_revision: str | Sequence[str] | None = "8e2d4b6a1c3f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add a partial index over live shopping list items for per-list counts."""
+    op.create_index(
+        "ix_shopping_list_items_active_list_id",
+        "shopping_list_items",
+        ["shopping_list_id", "is_deleted"],
+        postgresql_where=sa.text("NOT is_deleted"),
+        sqlite_where=sa.text("is_deleted = 0"),
+    )
+
+
+def downgrade() -> None:
+    """Drop the live shopping list items index."""
+    op.drop_index("ix_shopping_list_items_active_list_id", table_name="shopping_list_items")
@@ -0,0 +1,40 @@
+"""cover_upc_and_name_indexes
+
+Revision ID: 8e2d4b6a1c3f
+Revises: 3c1f9a2b7d4e
+Create Date: 2026-10-15 12:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2d4b6a1c3f"
+down_revision: str | Sequence[str] | None = "3c1f9a2b7d4e"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Rebuild the items.upc and locations.name indexes with INCLUDE (id) (PostgreSQL only).
+
+    SQLite indexes already carry the rowid, which is the id column.
+    """
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_items_upc", table_name="items")
+    op.create_index("ix_items_upc", "items", ["upc"], unique=True, postgresql_include=["id"])
+    op.drop_index("ix_locations_name", table_name="locations")
+    op.create_index("ix_locations_name", "locations", ["name"], postgresql_include=["id"])
+
+
+def downgrade() -> None:
+    """Restore the plain items.upc and locations.name indexes."""
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.drop_index("ix_locations_name", table_name="locations")
+    op.create_index("ix_locations_name", "locations", ["name"], unique=False)
+    op.drop_index("ix_items_upc", table_name="items")
+    op.create_index("ix_items_upc", "items", ["upc"], unique=True)
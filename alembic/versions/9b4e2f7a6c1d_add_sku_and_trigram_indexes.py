@@ -0,0 +1,50 @@
+"""add_sku_and_trigram_indexes
+
+Revision ID: 9b4e2f7a6c1d
+Revises: 5a7c9e1b3d2f
+Create Date: 2026-10-15 16:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b4e2f7a6c1d"
+down_revision: str | Sequence[str] | None = "5a7c9e1b3d2f"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+TRIGRAM_INDEXES = [
+    ("ix_items_name_trgm", "items", "name"),
+    ("ix_items_upc_trgm", "items", "upc"),
+    ("ix_locations_name_trgm", "locations", "name"),
+]
+
+
+def upgrade() -> None:
+    """Index SKUs by item/location, plus trigram indexes for search (PostgreSQL only)."""
+    op.create_index("ix_skus_item_id", "skus", ["item_id", "id"])
+    op.create_index("ix_skus_location_id", "skus", ["location_id", "id"])
+
+    if op.get_bind().dialect.name != "postgresql":
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    """Drop the SKU and trigram indexes; the pg_trgm extension is left installed."""
+    if op.get_bind().dialect.name == "postgresql":
+        for name, table, _column in reversed(TRIGRAM_INDEXES):
+            op.drop_index(name, table_name=table)
+    op.drop_index("ix_skus_location_id", table_name="skus")
+    op.drop_index("ix_skus_item_id", table_name="skus")
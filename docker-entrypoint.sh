@@ -35,7 +35,13 @@ else:
     with engine.connect() as conn:
         row = conn.execute(text('SELECT version_num FROM alembic_version LIMIT 1')).first()
     if row and row[0]:
-        print('UPGRADE')
+        # Also verify schema matches stamp in this same interpreter — 0.2.7
+        # stamp bug may have marked upc_data migration done without applying it
+        try:
+            cols = [c['name'] for c in inspector.get_columns('items')]
+        except Exception:
+            cols = []
+        print('UPGRADE' if 'upc_data' in cols else 'UPGRADE_MISSING_UPC_DATA')
     else:
         print('STAMP_NEEDED')  # table exists but empty
 " 2>/dev/null || echo "FALLBACK")
@@ -53,21 +59,9 @@ case "$DB_STATE" in
         echo "Fresh database. Running full migration..."
         alembic upgrade head
         ;;
-    UPGRADE)
+    UPGRADE|UPGRADE_MISSING_UPC_DATA)
         echo "Running pending migrations..."
-        # Verify schema matches stamp — 0.2.7 stamp bug may have
-        # marked upc_data migration done without applying it
-        HAS_UPC_DATA=$(python -c "
-from sqlalchemy import create_engine, inspect
-from stocky_backend.core.config import settings
-url = settings.DATABASE_URL
-if 'pysqlite' in url:
-    url = url.replace('sqlite+pysqlite', 'sqlite')
-engine = create_engine(url)
-cols = [c['name'] for c in inspect(engine).get_columns('items')]
-print('yes' if 'upc_data' in cols else 'no')
-" 2>/dev/null || echo "no")
-        if [ "$HAS_UPC_DATA" = "no" ]; then
+        if [ "$DB_STATE" = "UPGRADE_MISSING_UPC_DATA" ]; then
             echo "upc_data column missing — applying directly..."
             python -c "
 from sqlalchemy import create_engine, text
@@ -20,7 +20,8 @@ current_path = Path(__file__).parent.parent
 src_path = current_path / "src"
 sys.path.insert(0, str(src_path))
 
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, text, tuple_
+from sqlalchemy.orm import Session, joinedload
 
 from stocky_backend.db.database import SessionLocal
 from stocky_backend.models.models import (
@@ -112,29 +113,37 @@ def create_sample_items(db: Session, admin_user: User) -> list[Item]:
         },
     ]
 
-    items = []
     print("Creating sample items...")
 
+    # One IN-query for existing items instead of a SELECT per UPC
+    upcs = [item_data["upc"] for item_data in sample_items]
+    existing_items = db.query(Item).filter(Item.upc.in_(upcs)).order_by(Item.id).all()
+    existing_upcs = {item.upc for item in existing_items}
+
+    new_item_rows = []
     for item_data in sample_items:
-        # Check if item already exists
-        existing_item = db.query(Item).filter(Item.upc == item_data["upc"]).first()
-        if existing_item:
-            items.append(existing_item)
+        if item_data["upc"] in existing_upcs:
             continue
 
-        item = Item(
-            name=item_data["name"],
-            description=item_data["description"],
-            upc=item_data["upc"],
-            default_storage_type=item_data["default_storage_type"],
-            created_by=admin_user.id,
-            is_active=True,
+        new_item_rows.append(
+            {
+                "name": item_data["name"],
+                "description": item_data["description"],
+                "upc": item_data["upc"],
+                "default_storage_type": item_data["default_storage_type"],
+                "created_by": admin_user.id,
+                "is_active": True,
+            }
         )
-        db.add(item)
-        items.append(item)
 
-    db.commit()
-    print(f"✅ Created {len(sample_items)} sample items")
+    # Single multi-row INSERT ... RETURNING hands back the new rows (with IDs)
+    # in the same round trip, so there is no re-select afterwards
+    new_items: list[Item] = []
+    if new_item_rows:
+        new_items = list(db.scalars(insert(Item).returning(Item), new_item_rows))
+
+    items = [*existing_items, *new_items]
+    print(f"✅ Created {len(new_item_rows)} sample items")
     return items
 
 
@@ -143,7 +152,6 @@ def create_sample_skus(
 ) -> list[SKU]:
     """Create sample inventory (SKUs) with realistic quantities and expiry dates"""
 
-    skus = []
     print("Creating sample inventory (SKUs)...")
 
     # Define some realistic quantity ranges for different item types
@@ -177,65 +185,82 @@ def create_sample_skus(
         "Oatmeal": "containers",
     }
 
+    # Days until expiry for perishable items
+    expiry_day_ranges = {
+        "Whole Milk": (5, 14),
+        "Bread - Whole Wheat": (3, 7),
+        "Chicken Breast": (2, 5),
+        "Bananas": (3, 8),
+        "Eggs - Large": (14, 30),
+        "Greek Yogurt": (7, 21),
+    }
+
+    # Fixed seed so demo inventory is reproducible between runs
+    rng = random.Random("stocky-demo")
+
+    # First location of each storage type, so placement is a dict lookup per item
+    location_by_type: dict[str, Location] = {}
+    for location in locations:
+        location_by_type.setdefault(location.storage_type, location)
+
+    placements: list[tuple[Item, Location]] = []
     for item in items:
-        # Find appropriate location based on storage type
-        appropriate_location = None
-        for location in locations:
-            if location.storage_type == item.default_storage_type:
-                appropriate_location = location
-                break
-
-        if not appropriate_location:
-            # Fallback to pantry
-            appropriate_location = next(
-                (loc for loc in locations if loc.storage_type == StorageType.PANTRY),
-                locations[0],
-            )
-
-        # Check if SKU already exists
-        existing_sku = (
-            db.query(SKU)
-            .filter(SKU.item_id == item.id, SKU.location_id == appropriate_location.id)
-            .first()
+        # Find appropriate location based on storage type, falling back to pantry
+        appropriate_location = (
+            location_by_type.get(item.default_storage_type)
+            or location_by_type.get(StorageType.PANTRY)
+            or locations[0]
         )
-
-        if existing_sku:
-            skus.append(existing_sku)
+        placements.append((item, appropriate_location))
+
+    # One IN-query over (item_id, location_id) pairs instead of a SELECT per SKU
+    sku_pairs = [(item.id, location.id) for item, location in placements]
+    # Eager-load the item/location that alert messages read instead of
+    # lazy-loading per SKU
+    existing_skus = (
+        db.query(SKU)
+        .options(joinedload(SKU.item), joinedload(SKU.location))
+        .filter(tuple_(SKU.item_id, SKU.location_id).in_(sku_pairs))
+        .order_by(SKU.id)
+        .all()
+    )
+    existing_pairs = {(sku.item_id, sku.location_id) for sku in existing_skus}
+
+    now = datetime.now()
+    new_sku_rows = []
+    for item, appropriate_location in placements:
+        if (item.id, appropriate_location.id) in existing_pairs:
             continue
 
         # Generate realistic quantity
-        quantity_range = quantity_ranges.get(item.name, (1, 5))
-        quantity = random.randint(*quantity_range)
+        quantity = rng.randint(*quantity_ranges.get(item.name, (1, 5)))
 
         # Generate expiry date (some items expire sooner than others)
-        days_to_expiry = {
-            "Whole Milk": random.randint(5, 14),
-            "Bread - Whole Wheat": random.randint(3, 7),
-            "Chicken Breast": random.randint(2, 5),
-            "Bananas": random.randint(3, 8),
-            "Eggs - Large": random.randint(14, 30),
-            "Greek Yogurt": random.randint(7, 21),
-        }
-
         expiry_date = None
-        if item.name in days_to_expiry:
-            expiry_date = datetime.now() + timedelta(days=days_to_expiry[item.name])
-
-        sku = SKU(
-            item_id=item.id,
-            location_id=appropriate_location.id,
-            quantity=quantity,
-            unit=units.get(item.name, "units"),
-            expiry_date=expiry_date,
-            created_by=admin_user.id,
-            is_active=True,
+        if item.name in expiry_day_ranges:
+            days_to_expiry = rng.randint(*expiry_day_ranges[item.name])
+            expiry_date = now + timedelta(days=days_to_expiry)
+
+        new_sku_rows.append(
+            {
+                "item_id": item.id,
+                "location_id": appropriate_location.id,
+                "quantity": quantity,
+                "unit": units.get(item.name, "units"),
+                "expiry_date": expiry_date,
+                "created_by": admin_user.id,
+                "is_active": True,
+            }
         )
 
-        db.add(sku)
-        skus.append(sku)
+    # RETURNING gives back persisted SKUs with IDs; their item/location are
+    # already in the identity map, so accessing them later issues no SELECT
+    new_skus: list[SKU] = []
+    if new_sku_rows:
+        new_skus = list(db.scalars(insert(SKU).returning(SKU), new_sku_rows))
 
-    db.commit()
-    print(f"✅ Created {len(skus)} sample inventory entries (SKUs)")
+    skus = [*existing_skus, *new_skus]
+    print(f"✅ Created {len(new_sku_rows)} sample inventory entries (SKUs)")
     return skus
 
 
@@ -244,40 +269,44 @@ def create_sample_alerts(db: Session, admin_user: User, skus: list[SKU]) -> None
 
     print("Creating sample alerts...")
 
+    alert_rows = []
+
     # Create a few low stock alerts
     low_stock_skus = [sku for sku in skus if sku.quantity <= 2][:3]
 
     for sku in low_stock_skus:
-        alert = Alert(
-            alert_type="low_stock",
-            message=f"Low stock alert: {sku.item.name} in {sku.location.name} is running low ({sku.quantity} {sku.unit} remaining)",
-            threshold_value=3.0,
-            sku_id=sku.id,
-            created_by=admin_user.id,
-            is_active=True,
-            is_acknowledged=False,
+        alert_rows.append(
+            {
+                "alert_type": "low_stock",
+                "message": f"Low stock alert: {sku.item.name} in {sku.location.name} is running low ({sku.quantity} {sku.unit} remaining)",
+                "threshold_value": 3.0,
+                "sku_id": sku.id,
+                "created_by": admin_user.id,
+                "is_active": True,
+                "is_acknowledged": False,
+            }
         )
-        db.add(alert)
 
     # Create expiry warnings for items expiring soon
+    expiry_cutoff = datetime.now() + timedelta(days=3)
     soon_expiring_skus = [
-        sku
-        for sku in skus
-        if sku.expiry_date and sku.expiry_date <= datetime.now() + timedelta(days=3)
+        sku for sku in skus if sku.expiry_date and sku.expiry_date <= expiry_cutoff
     ][:2]
 
     for sku in soon_expiring_skus:
-        alert = Alert(
-            alert_type="expiry_warning",
-            message=f"Expiry warning: {sku.item.name} in {sku.location.name} expires on {sku.expiry_date.strftime('%Y-%m-%d')}",
-            sku_id=sku.id,
-            created_by=admin_user.id,
-            is_active=True,
-            is_acknowledged=False,
+        alert_rows.append(
+            {
+                "alert_type": "expiry_warning",
+                "message": f"Expiry warning: {sku.item.name} in {sku.location.name} expires on {sku.expiry_date.strftime('%Y-%m-%d')}",
+                "sku_id": sku.id,
+                "created_by": admin_user.id,
+                "is_active": True,
+                "is_acknowledged": False,
+            }
         )
-        db.add(alert)
 
-    db.commit()
+    if alert_rows:
+        db.bulk_insert_mappings(Alert, alert_rows)
     print("✅ Created sample alerts")
 
 
@@ -296,22 +325,27 @@ def main():
     db = SessionLocal()
 
     try:
-        # Get admin user
-        admin_user = db.query(User).filter(User.role == UserRole.ADMIN).first()
-        if not admin_user:
-            print("❌ No admin user found! Please run scripts/initial_data.py first.")
-            sys.exit(1)
-
-        # Get locations
-        locations = db.query(Location).all()
-        if not locations:
-            print("❌ No locations found! Please run scripts/initial_data.py first.")
-            sys.exit(1)
-
-        # Create demo data
-        items = create_sample_items(db, admin_user)
-        skus = create_sample_skus(db, admin_user, items, locations)
-        create_sample_alerts(db, admin_user, skus)
+        # Run every step in one transaction so the whole setup commits (and syncs) once
+        with db.begin():
+            if db.get_bind().dialect.name == "sqlite":
+                db.execute(text("PRAGMA synchronous=NORMAL"))
+
+            # Get admin user
+            admin_user = db.query(User).filter(User.role == UserRole.ADMIN).first()
+            if not admin_user:
+                print("❌ No admin user found! Please run scripts/initial_data.py first.")
+                sys.exit(1)
+
+            # Get locations
+            locations = db.query(Location).all()
+            if not locations:
+                print("❌ No locations found! Please run scripts/initial_data.py first.")
+                sys.exit(1)
+
+            # Create demo data
+            items = create_sample_items(db, admin_user)
+            skus = create_sample_skus(db, admin_user, items, locations)
+            create_sample_alerts(db, admin_user, skus)
 
         print("\n✅ Demo data setup completed successfully!")
         print(f"📦 Created inventory for {len(items)} different items")
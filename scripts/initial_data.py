@@ -7,10 +7,15 @@ Run this after setting up the database to bootstrap the application.
 
 Usage:
     python scripts/initial_data.py
+
+For unattended setup (Docker init, CI), set STOCKY_ADMIN_USERNAME,
+STOCKY_ADMIN_EMAIL and STOCKY_ADMIN_PASSWORD; any that are unset are
+prompted for interactively.
 """
 
 import os
 import sys
+from collections.abc import Callable
 from pathlib import Path
 
 # Add the src directory to the Python path
@@ -20,19 +25,35 @@ sys.path.insert(0, str(src_path))
 
 import getpass
 
-from passlib.context import CryptContext
+from sqlalchemy import text
 from sqlalchemy.orm import Session
 
+from stocky_backend.core.auth import hash_password
 from stocky_backend.db.database import SessionLocal
 from stocky_backend.models.models import Location, StorageType, User, UserRole
 
-# Password hashing
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+def _get_admin_field(
+    env_var: str,
+    prompt: str,
+    is_valid: Callable[[str], bool],
+    error: str,
+    secret: bool = False,
+) -> str:
+    """Read an admin field from the environment, prompting until valid if unset"""
+    value = os.environ.get(env_var)
+    if value is not None:
+        if not secret:
+            value = value.strip()
+        if not is_valid(value):
+            raise ValueError(f"{env_var}: {error}")
+        return value
 
-def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
-    return pwd_context.hash(password)
+    while True:
+        value = getpass.getpass(prompt) if secret else input(prompt).strip()
+        if is_valid(value):
+            return value
+        print(error)
 
 
 def create_admin_user(db: Session) -> User:
@@ -46,24 +67,26 @@ def create_admin_user(db: Session) -> User:
 
     print("Creating the first admin user...")
 
-    # Get user input
-    while True:
-        username = input("Enter admin username: ").strip()
-        if username:
-            break
-        print("Username cannot be empty!")
-
-    while True:
-        email = input("Enter admin email: ").strip()
-        if email and "@" in email:
-            break
-        print("Please enter a valid email address!")
-
-    while True:
-        password = getpass.getpass("Enter admin password: ")
-        if len(password) >= 8:
-            break
-        print("Password must be at least 8 characters long!")
+    # Get user input (environment first, then prompt)
+    username = _get_admin_field(
+        "STOCKY_ADMIN_USERNAME",
+        "Enter admin username: ",
+        lambda v: bool(v),
+        "Username cannot be empty!",
+    )
+    email = _get_admin_field(
+        "STOCKY_ADMIN_EMAIL",
+        "Enter admin email: ",
+        lambda v: bool(v) and "@" in v,
+        "Please enter a valid email address!",
+    )
+    password = _get_admin_field(
+        "STOCKY_ADMIN_PASSWORD",
+        "Enter admin password: ",
+        lambda v: len(v) >= 8,
+        "Password must be at least 8 characters long!",
+        secret=True,
+    )
 
     # Create the admin user
     admin_user = User(
@@ -75,8 +98,7 @@ def create_admin_user(db: Session) -> User:
     )
 
     db.add(admin_user)
-    db.commit()
-    db.refresh(admin_user)
+    db.flush()  # assign admin_user.id without committing
 
     print(f"✅ Admin user '{username}' created successfully!")
     return admin_user
@@ -116,17 +138,17 @@ def create_default_locations(db: Session, admin_user: User) -> None:
         },
     ]
 
-    for location_data in default_locations:
-        location = Location(
-            name=location_data["name"],
-            description=location_data["description"],
-            storage_type=location_data["storage_type"],
-            created_by=admin_user.id,
-            is_active=True,
-        )
-        db.add(location)
-
-    db.commit()
+    location_rows = [
+        {
+            "name": location_data["name"],
+            "description": location_data["description"],
+            "storage_type": location_data["storage_type"],
+            "created_by": admin_user.id,
+            "is_active": True,
+        }
+        for location_data in default_locations
+    ]
+    db.bulk_insert_mappings(Location, location_rows)
     print(f"✅ Created {len(default_locations)} default locations")
 
 
@@ -145,11 +167,16 @@ def main():
     db = SessionLocal()
 
     try:
-        # Create admin user
-        admin_user = create_admin_user(db)
+        # Run every step in one transaction so the whole setup commits (and syncs) once
+        with db.begin():
+            if db.get_bind().dialect.name == "sqlite":
+                db.execute(text("PRAGMA synchronous=NORMAL"))
+
+            # Create admin user
+            admin_user = create_admin_user(db)
 
-        # Create default locations
-        create_default_locations(db, admin_user)
+            # Create default locations
+            create_default_locations(db, admin_user)
 
         print("\n✅ Initial data setup completed successfully!")
         print("\nYou can now start the Stocky Backend server.")
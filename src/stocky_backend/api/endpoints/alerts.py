@@ -8,12 +8,14 @@ router = APIRouter()
 
 
 @router.get("/")
+@router.get("", include_in_schema=False)
 async def list_alerts():
     """List all alerts"""
     return {"message": "Alerts list endpoint - to be implemented"}
 
 
 @router.post("/")
+@router.post("", include_in_schema=False)
 async def create_alert():
     """Create a new alert"""
     return {"message": "Alert creation endpoint - to be implemented"}
@@ -2,6 +2,9 @@
 Authentication endpoints — session-based auth.
 """
 
+from datetime import UTC, datetime
+from types import SimpleNamespace
+
 from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from fastapi.security import OAuth2PasswordRequestForm
 from sqlalchemy.orm import Session
@@ -11,20 +14,42 @@ from ...core.auth import (
     generate_api_key,
     get_session_token_from_cookie,
     hash_password,
+    password_needs_rehash,
     set_session_cookie,
+    verify_dummy_password,
     verify_password,
 )
 from ...core.security import get_current_active_user
 from ...crud.crud import session as session_crud
+from ...crud.crud import user as user_crud
 from ...db.database import get_db
-from ...models.models import User
+from ...models.models import User, UserRole
 from ...schemas.schemas import LoginRequest, PasswordChange, SessionResponse, UserResponse
 
 router = APIRouter()
 
 
+def warm_up_response_models() -> None:
+    """Validate and serialize the auth response models once at startup.
+
+    Keeps Pydantic's first-call work off the first real /login or /me request.
+    """
+    now = datetime.now(UTC)
+    user = SimpleNamespace(
+        id=0,
+        username="warmup",
+        email="warmup@example.com",
+        role=UserRole.MEMBER,
+        is_active=True,
+        created_at=now,
+        updated_at=now,
+    )
+    UserResponse.model_validate(user).model_dump_json()
+    SessionResponse(user_id=0, username="warmup", role=UserRole.MEMBER).model_dump_json()
+
+
 @router.post("/login", response_model=SessionResponse)
-async def login(
+def login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
     remember_me: bool = False,
@@ -33,23 +58,34 @@ async def login(
     """User login — creates a session, sets cookie, returns user info."""
     user = db.query(User).filter(User.username == form_data.username).first()
     if not user or not user.is_active:
+        # Pay the same bcrypt cost as a wrong password so timing doesn't
+        # reveal which usernames exist
+        verify_dummy_password(form_data.password)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
+    # bcrypt is CPU-bound; as a sync handler this runs off the event loop
     if not verify_password(form_data.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
-
+    if password_needs_rehash(user.hashed_password):
+        # Saved by the session commit below
+        user.hashed_password = hash_password(form_data.password)
+
+    # Read the response fields before create() commits and expires ``user``,
+    # which would otherwise cost another SELECT to reload it. A plain dict so
+    # response_model validates it once rather than re-validating a model.
+    session_response = {"user_id": user.id, "role": user.role, "username": user.username}
     raw_token = session_crud.create(db, user_id=user.id, is_persistent=remember_me)
     set_session_cookie(response, raw_token, persistent=remember_me)
-    return SessionResponse(user_id=user.id, role=user.role, username=user.username)
+    return session_response
 
 
 @router.post("/login-json", response_model=SessionResponse)
-async def login_json(
+def login_json(
     login_data: LoginRequest,
     response: Response,
     db: Session = Depends(get_db),
@@ -57,6 +93,9 @@ async def login_json(
     """User login via JSON — creates a session, sets cookie, returns user info."""
     user = db.query(User).filter(User.username == login_data.username).first()
     if not user or not user.is_active:
+        # Pay the same bcrypt cost as a wrong password so timing doesn't
+        # reveal which usernames exist
+        verify_dummy_password(login_data.password)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
@@ -66,35 +105,46 @@ async def login_json(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
         )
-
+    if password_needs_rehash(user.hashed_password):
+        # Saved by the session commit below
+        user.hashed_password = hash_password(login_data.password)
+
+    # Read the response fields before create() commits and expires ``user``,
+    # which would otherwise cost another SELECT to reload it. A plain dict so
+    # response_model validates it once rather than re-validating a model.
+    session_response = {"user_id": user.id, "role": user.role, "username": user.username}
     raw_token = session_crud.create(db, user_id=user.id, is_persistent=login_data.remember_me)
     set_session_cookie(response, raw_token, persistent=login_data.remember_me)
-    return SessionResponse(user_id=user.id, role=user.role, username=user.username)
+    return session_response
 
 
 @router.post("/logout")
-async def logout(
+def logout(
     request: Request,
     response: Response,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """User logout — deletes session from DB and clears cookie."""
+    # Read before delete() commits and expires the user
+    username = current_user.username
     token = get_session_token_from_cookie(request)
     if token:
         session_crud.delete(db, token)
     clear_session_cookie(response)
-    return {"message": f"User {current_user.username} logged out successfully"}
+    return {"message": f"User {username} logged out successfully"}
 
 
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: User = Depends(get_current_active_user)):
     """Get current user information."""
-    return UserResponse.model_validate(current_user)
+    # response_model already validates and serializes the ORM object once;
+    # wrapping it in UserResponse here would run that work twice
+    return current_user
 
 
 @router.post("/change-password")
-async def change_password(
+def change_password(
     password_data: PasswordChange,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
@@ -117,15 +167,13 @@ async def change_password(
 
 
 @router.post("/generate-api-key")
-async def generate_new_api_key(
+def generate_new_api_key(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Generate a new API key for the current user."""
     new_api_key = generate_api_key()
-    current_user.api_key = new_api_key
-    db.commit()
-    db.refresh(current_user)
+    user_crud.set_api_key(db, current_user.id, new_api_key)
     return {
         "message": "API key generated successfully",
         "api_key": new_api_key,
@@ -134,11 +182,10 @@ async def generate_new_api_key(
 
 
 @router.delete("/revoke-api-key")
-async def revoke_api_key(
+def revoke_api_key(
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db),
 ):
     """Revoke the current user's API key."""
-    current_user.api_key = None
-    db.commit()
+    user_crud.set_api_key(db, current_user.id, None)
     return {"message": "API key revoked successfully"}
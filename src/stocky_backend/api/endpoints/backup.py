@@ -2,15 +2,22 @@
 Backup and restore endpoints — database-agnostic JSON export/import.
 """
 
+import functools
 import gzip
 import json
+import re
+import zlib
+from collections.abc import Iterable, Iterator
 from datetime import datetime, UTC
+from typing import IO
 
 from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
-from sqlalchemy import inspect, text
+from sqlalchemy import Engine, TextClause, inspect, text
 from sqlalchemy.orm import Session
 
+from ...core.cache import page_cache, user_cache
 from ...core.security import require_admin
 from ...db.database import get_db
 from ...models.models import User
@@ -39,11 +46,46 @@ TABLE_ORDER = [
 ]
 
 
-def _get_all_rows(db: Session, table_name: str) -> list[dict]:
-    """Get all rows from a table as a list of dicts."""
-    result = db.execute(text(f"SELECT * FROM {table_name}"))  # noqa: S608  # table_name from SQLAlchemy inspector
+@functools.lru_cache(maxsize=4)
+def _backup_table_names(engine: Engine) -> tuple[str, ...]:
+    """Names of the tables to back up, cached per engine.
+
+    The schema only changes through Alembic migrations, which run before the
+    app starts, so reflecting it on every backup request is wasted work.
+    """
+    return tuple(t for t in inspect(engine).get_table_names() if t not in SKIP_TABLES)
+
+
+# Column names come from the uploaded file and are spliced into SQL, so they
+# must be plain identifiers
+_IDENTIFIER_RE = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# INSERT forms that skip conflicting rows, used by merge restores
+_INSERT_IGNORE = {
+    "sqlite": ("INSERT OR IGNORE INTO", ""),
+    "postgresql": ("INSERT INTO", " ON CONFLICT DO NOTHING"),
+    "mysql": ("INSERT IGNORE INTO", ""),
+}
+
+# Rows fetched per round trip while streaming a backup
+BACKUP_FETCH_SIZE = 1000
+
+# gzip level 1 compresses row-shaped JSON ~1.7x faster than the default 6 for
+# ~7% larger output; text is batched so zlib sees ~64KB per call
+BACKUP_GZIP_LEVEL = 1
+BACKUP_COMPRESS_CHUNK = 64 * 1024
+
+
+def _iter_table_rows(db: Session, table_name: str) -> Iterator[dict]:
+    """Yield rows from a table as dicts, fetching BACKUP_FETCH_SIZE at a time."""
+    result = db.execute(
+        text(f"SELECT * FROM {table_name}"),  # noqa: S608  # table_name from SQLAlchemy inspector
+        execution_options={"stream_results": True},
+    )
     columns = list(result.keys())
-    return [dict(zip(columns, row, strict=False)) for row in result.fetchall()]
+    for partition in result.partitions(BACKUP_FETCH_SIZE):
+        for row in partition:
+            yield dict(zip(columns, row, strict=False))
 
 
 def _serialize_value(val) -> object:
@@ -53,40 +95,92 @@ def _serialize_value(val) -> object:
     return val
 
 
+def _iter_backup_json(db: Session, tables: list[str], metadata: dict) -> Iterator[str]:
+    """Yield the backup document as JSON text, one row at a time.
+
+    Produces the same ``{"metadata": ..., "data": {table: [rows]}}`` document
+    that restore reads, without building it in memory first.
+    """
+    yield '{"metadata": ' + json.dumps(metadata) + ', "data": {'
+    for table_index, table in enumerate(tables):
+        if table_index:
+            yield ", "
+        yield json.dumps(table) + ": ["
+        for row_index, row in enumerate(_iter_table_rows(db, table)):
+            serialized = {k: _serialize_value(v) for k, v in row.items()}
+            yield (", " if row_index else "") + json.dumps(serialized, default=str)
+        yield "]"
+    yield "}}"
+
+
+def _gzip_chunks(chunks: Iterable[str]) -> Iterator[bytes]:
+    """Gzip-compress text chunks incrementally."""
+    compressor = zlib.compressobj(BACKUP_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    pending: list[str] = []
+    pending_size = 0
+    for chunk in chunks:
+        pending.append(chunk)
+        pending_size += len(chunk)
+        if pending_size >= BACKUP_COMPRESS_CHUNK:
+            compressed = compressor.compress("".join(pending).encode("utf-8"))
+            pending.clear()
+            pending_size = 0
+            if compressed:
+                yield compressed
+    yield compressor.compress("".join(pending).encode("utf-8")) + compressor.flush()
+
+
+def _insert_statement(
+    table: str, columns: tuple[str, ...], ignore_conflicts: str | None = None
+) -> TextClause:
+    """Build a parameterized INSERT for one table/column set.
+
+    ``ignore_conflicts`` is a dialect name from _INSERT_IGNORE; rows that would
+    violate a constraint are then skipped instead of failing the statement.
+    """
+    invalid = [column for column in columns if not _IDENTIFIER_RE.fullmatch(column)]
+    if invalid:
+        raise HTTPException(
+            status_code=400, detail=f"Invalid column name(s) in backup for {table}: {invalid}"
+        )
+    insert_into, conflict_clause = (
+        _INSERT_IGNORE[ignore_conflicts] if ignore_conflicts else ("INSERT INTO", "")
+    )
+    column_list = ", ".join(columns)
+    placeholders = ", ".join(f":{column}" for column in columns)
+    return text(f"{insert_into} {table} ({column_list}) VALUES ({placeholders}){conflict_clause}")  # noqa: S608  # table from trusted TABLE_ORDER
+
+
+def _count_rows(db: Session, table: str) -> int:
+    """Row count for a table name from the inspector or TABLE_ORDER."""
+    return db.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar() or 0  # noqa: S608  # trusted table name
+
+
+def _load_backup_file(fileobj: IO[bytes]) -> dict:
+    """Decompress and parse an uploaded .json.gz backup straight from the upload file."""
+    with gzip.GzipFile(fileobj=fileobj, mode="rb") as gz:
+        return json.load(gz)
+
+
 @router.get("/download")
 async def download_backup(
     db: Session = Depends(get_db),
     current_user: User = Depends(require_admin),
 ):
     """Download a full database backup as a gzipped JSON file. Database-agnostic."""
-    inspector = inspect(db.get_bind())
-    all_tables = [t for t in inspector.get_table_names() if t not in SKIP_TABLES]
-
-    export_data: dict[str, list[dict]] = {}
-    for table in all_tables:
-        rows = _get_all_rows(db, table)
-        export_data[table] = [{k: _serialize_value(v) for k, v in row.items()} for row in rows]
-
-    backup = {
-        "metadata": {
-            "version": "1.0",
-            "timestamp": datetime.now(UTC).isoformat(),
-            "tables": sorted(all_tables),
-        },
-        "data": export_data,
-    }
+    all_tables = list(_backup_table_names(db.get_bind().engine))
 
-    json_bytes = json.dumps(backup, default=str).encode("utf-8")
-    compressed = gzip.compress(json_bytes)
+    metadata = {
+        "version": "1.0",
+        "timestamp": datetime.now(UTC).isoformat(),
+        "tables": sorted(all_tables),
+    }
 
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     filename = f"stocky_backup_{timestamp}.json.gz"
 
-    def generate():
-        yield compressed
-
     return StreamingResponse(
-        generate(),
+        _gzip_chunks(_iter_backup_json(db, all_tables, metadata)),
         media_type="application/gzip",
         headers={"Content-Disposition": f"attachment; filename={filename}"},
     )
@@ -114,51 +208,72 @@ async def restore_backup(
         raise HTTPException(status_code=400, detail="File must be a .json.gz backup")
 
     try:
-        content = await file.read()
-        json_str = gzip.decompress(content).decode("utf-8")
-        backup: dict = json.loads(json_str)
-    except (gzip.BadGzipFile, json.JSONDecodeError, UnicodeDecodeError) as e:
+        backup: dict = await run_in_threadpool(_load_backup_file, file.file)
+    except (gzip.BadGzipFile, EOFError, json.JSONDecodeError, UnicodeDecodeError) as e:
         raise HTTPException(status_code=400, detail=f"Invalid backup file: {e}")
 
     data = backup.get("data", {})
     if not data:
         raise HTTPException(status_code=400, detail="Backup contains no table data")
 
-    if mode == "replace":
-        # Delete all data in reverse dependency order.
-        for table in reversed(TABLE_ORDER):
-            if table in data:
-                db.execute(text(f"DELETE FROM {table}"))  # noqa: S608  # table from trusted TABLE_ORDER
-        db.commit()
-
-    records_imported = 0
-    tables_affected: list[str] = []
-
+    dialect = db.get_bind().dialect.name
+    ignore_conflicts = None
+    if mode == "merge":
+        if dialect not in _INSERT_IGNORE:
+            raise HTTPException(
+                status_code=400, detail=f"Merge restore is not supported on {dialect}"
+            )
+        ignore_conflicts = dialect
+
+    # Group each table's rows by column set so every group is one executemany
+    # (rows of a table almost always share a single column set). Statements
+    # are built, and column names validated, before anything is deleted.
+    plan: list[tuple[str, int, list[tuple[TextClause, list[dict]]]]] = []
     for table in TABLE_ORDER:
         rows = data.get(table, [])
         if not rows:
             continue
-        tables_affected.append(table)
-
+        batches: dict[tuple[str, ...], list[dict]] = {}
         for row in rows:
-            columns = ", ".join(row.keys())
-            placeholders = ", ".join(f":{k}" for k in row)
-            try:
-                db.execute(text(f"INSERT INTO {table} ({columns}) VALUES ({placeholders})"), row)  # noqa: S608  # table from trusted TABLE_ORDER
-                records_imported += 1
-            except Exception:
-                if mode == "merge":
-                    # Skip conflicting rows in merge mode
-                    db.rollback()
-                    continue
-                raise
+            batches.setdefault(tuple(row), []).append(row)
+        statements = [
+            (_insert_statement(table, columns, ignore_conflicts), batch)
+            for columns, batch in batches.items()
+        ]
+        plan.append((table, len(rows), statements))
+
+    records_imported = 0
+    try:
+        if mode == "replace":
+            # Delete all data in reverse dependency order. Not committed here:
+            # the deletes and inserts share one transaction, so a failed restore
+            # rolls back to the original data instead of leaving tables emptied.
+            for table in reversed(TABLE_ORDER):
+                if table in data:
+                    db.execute(text(f"DELETE FROM {table}"))  # noqa: S608  # table from trusted TABLE_ORDER
+
+        for table, row_count, statements in plan:
+            # Merge skips conflicting rows, so count what actually landed
+            count_before = _count_rows(db, table) if ignore_conflicts else 0
+            for statement, batch in statements:
+                db.execute(statement, batch)
+            if ignore_conflicts:
+                records_imported += _count_rows(db, table) - count_before
+            else:
+                records_imported += row_count
+    except Exception:
+        db.rollback()
+        raise
 
     db.commit()
+    # Raw SQL bypasses the ORM write tracking, so drop cached pages explicitly
+    page_cache.invalidate(*(table for table, _, _ in plan))
+    user_cache.clear()
 
     return BackupImportResponse(
         success=True,
         message=f"Restore complete ({mode} mode)",
-        tables_affected=tables_affected,
+        tables_affected=[table for table, _, _ in plan],
         records_imported=records_imported,
         timestamp=datetime.now(),
     )
@@ -170,13 +285,9 @@ async def backup_status(
     current_user: User = Depends(require_admin),
 ):
     """Get database status — table names and row counts."""
-    inspector = inspect(db.get_bind())
     tables: dict[str, int] = {}
-    for table_name in inspector.get_table_names():
-        if table_name in SKIP_TABLES:
-            continue
-        result = db.execute(text(f"SELECT COUNT(*) FROM {table_name}"))  # noqa: S608  # table_name from SQLAlchemy inspector
-        tables[table_name] = result.scalar() or 0
+    for table_name in _backup_table_names(db.get_bind().engine):
+        tables[table_name] = _count_rows(db, table_name)
 
     from ...core.config import settings
 
@@ -2,35 +2,48 @@
 Item management endpoints
 """
 
-from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from ...core.cache import dump_json_array, page_cache
 from ...core.security import require_user_role
-from ...crud.crud import ItemCRUD, LogEntryCRUD
+from ...crud.crud import SKUCRUD, ItemCRUD
 from ...db.database import get_db
 from ...models.models import Item
 from ...schemas.schemas import ItemCreate, ItemResponse, ItemUpdate
+from ...services.log_writer import enqueue_log
 from ...services.upc_background import fetch_and_update_item
 from ...services.upc_lookup import upc_lookup_service
 
 router = APIRouter()
+_item_adapter = TypeAdapter(ItemResponse)
 item_crud = ItemCRUD()
+sku_crud = SKUCRUD()
 
 
 @router.get("/", response_model=list[ItemResponse])
-async def list_items(
+@router.get("", response_model=list[ItemResponse], include_in_schema=False)
+def list_items(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=500, description="Number of items to return"),
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
 ):
     """List all items with pagination"""
-    items = item_crud.get_multi(db, skip=skip, limit=limit)
-    return items
+    cache_key = page_cache.key("items", skip, limit)
+    body = page_cache.get(cache_key)
+    if body is None:
+        body = dump_json_array(_item_adapter, item_crud.iter_multi(db, skip=skip, limit=limit))
+        # Hand the pooled connection back before the response is sent
+        db.close()
+        page_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=ItemResponse)
-async def create_item(
+@router.post("", response_model=ItemResponse, include_in_schema=False)
+def create_item(
     item: ItemCreate,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -42,26 +55,19 @@ async def create_item(
     product data will be fetched in the background after the response
     is sent. If no name was provided, a placeholder is used temporarily.
     """
-    # Check if item with same UPC already exists
-    if item.upc:
-        existing_item = item_crud.get_by_upc(db, upc=item.upc)
-        if existing_item:
-            raise HTTPException(status_code=400, detail=f"Item with UPC {item.upc} already exists")
-
     # If UPC service is available and no name was provided, use placeholder
     should_fetch_upc = upc_lookup_service.is_available() and item.upc and not item.upc_data
 
-    db_item = item_crud.create(
+    # Duplicate-UPC check and insert in one statement
+    db_item = item_crud.create_if_unique(
         db,
-        obj_in=item,
-        created_by_id=current_user.id,
-        upc_data=None,
-        uda_fetched=False,
-        uda_fetch_attempted=False,
+        obj_in={**item.model_dump(), "created_by": current_user.id, "is_active": True},
+        unique_field="upc",
     )
+    if db_item is None:
+        raise HTTPException(status_code=400, detail=f"Item with UPC {item.upc} already exists")
 
     # Log creation
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"Item created: {db_item.name} (ID: {db_item.id})",
         "level": "INFO",
@@ -69,7 +75,7 @@ async def create_item(
         "function": "create_item",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
 
     # Schedule background UPC lookup if applicable
     if should_fetch_upc:
@@ -79,7 +85,7 @@ async def create_item(
 
 
 @router.get("/search", response_model=list[ItemResponse])
-async def search_items(
+def search_items(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=500, description="Number of items to return"),
@@ -88,11 +94,12 @@ async def search_items(
 ):
     """Search items by name, description, or UPC"""
     items = item_crud.search(db, query=q, skip=skip, limit=limit)
+    db.close()
     return items
 
 
 @router.get("/{item_id}", response_model=ItemResponse)
-async def get_item(
+def get_item(
     item_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
@@ -105,7 +112,7 @@ async def get_item(
 
 
 @router.put("/{item_id}", response_model=ItemResponse)
-async def update_item(
+def update_item(
     item_id: int,
     item_update: ItemUpdate,
     db: Session = Depends(get_db),
@@ -115,25 +122,30 @@ async def update_item(
     if not db_item:
         raise HTTPException(status_code=404, detail="Item not found")
 
-    # Check if updating UPC would conflict with existing item
-    if item_update.upc and item_update.upc != db_item.upc:
-        existing_item = item_crud.get_by_upc(db, upc=item_update.upc)
-        if existing_item and existing_item.id != item_id:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Item with UPC {item_update.upc} already exists",
-            )
-
-    # Compare changes BEFORE update
-    changes = {}
+    # Compare changes BEFORE update; a PUT that changes nothing writes nothing
     update_data = item_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        old_value = getattr(db_item, field, None)
-        if value != old_value:
-            changes[field] = {"old": old_value, "new": value}
-    updated_item = item_crud.update(db, db_obj=db_item, obj_in=item_update)
+    old = {field: getattr(db_item, field, None) for field in update_data}
+    changes = {
+        field: {"old": old[field], "new": value}
+        for field, value in update_data.items()
+        if value != old[field]
+    }
+    if not changes:
+        return db_item
+
+    # The UPC uniqueness check runs inside the UPDATE itself
+    updated_item = item_crud.update_if_unique(
+        db,
+        db_obj=db_item,
+        obj_in={field: change["new"] for field, change in changes.items()},
+        unique_field="upc",
+    )
+    if updated_item is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Item with UPC {item_update.upc} already exists",
+        )
     # Log update with details
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"Item updated: {updated_item.name} (ID: {updated_item.id})",
         "level": "INFO",
@@ -142,12 +154,12 @@ async def update_item(
         "user_id": current_user.id,
         "extra_data": {"changes": changes},
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return updated_item
 
 
 @router.delete("/{item_id}")
-async def delete_item(
+def delete_item(
     item_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role("admin")),
@@ -158,16 +170,11 @@ async def delete_item(
         raise HTTPException(status_code=404, detail="Item not found")
 
     # Check for related SKUs
-    from ...crud.crud import SKUCRUD
-
-    sku_crud = SKUCRUD()
-    related_skus = sku_crud.get_by_item(db, item_id)
-    if related_skus:
+    if sku_crud.exists_for_item(db, item_id):
         raise HTTPException(status_code=409, detail="Cannot delete item: SKUs exist for this item.")
 
     item_crud.remove(db, id=item_id)
     # Log deletion
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"Item deleted: {db_item.name} (ID: {db_item.id})",
         "level": "INFO",
@@ -175,12 +182,12 @@ async def delete_item(
         "function": "delete_item",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return {"message": "Item deleted successfully"}
 
 
 @router.post("/{item_id}/refresh-upc")
-async def refresh_upc_data(
+def refresh_upc_data(
     item_id: int,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -208,7 +215,6 @@ async def refresh_upc_data(
     background_tasks.add_task(fetch_and_update_item, item.upc, item.id)
 
     # Log the manual refresh
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"UPC refresh triggered for item {item.name} (ID: {item.id}, UPC: {item.upc})",
         "level": "INFO",
@@ -216,7 +222,7 @@ async def refresh_upc_data(
         "function": "refresh_upc_data",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
 
     return {
         "message": f"UPC refresh scheduled for item {item_id}",
@@ -226,7 +232,7 @@ async def refresh_upc_data(
 
 
 @router.post("/refresh-upc-missing")
-async def refresh_missing_upc_data(
+def refresh_missing_upc_data(
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role("manager")),
@@ -255,7 +261,6 @@ async def refresh_missing_upc_data(
         count += 1
 
     # Log the batch refresh
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"Batch UPC refresh triggered for {count} items",
         "level": "INFO",
@@ -264,7 +269,7 @@ async def refresh_missing_upc_data(
         "user_id": current_user.id,
         "extra_data": {"count": count},
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
 
     return {
         "message": f"UPC refresh scheduled for {count} items",
@@ -273,7 +278,7 @@ async def refresh_missing_upc_data(
 
 
 @router.get("/upc/{upc}", response_model=ItemResponse)
-async def get_item_by_upc(
+def get_item_by_upc(
     upc: str, db: Session = Depends(get_db), current_user=Depends(require_user_role())
 ):
     """Get an item by UPC code"""
@@ -2,48 +2,63 @@
 Location management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from ...core.cache import dump_json_array, page_cache
 from ...core.security import require_user_role
-from ...crud.crud import LocationCRUD, LogEntryCRUD
+from ...crud.crud import LocationCRUD
 from ...db.database import get_db
 from ...schemas.schemas import LocationCreate, LocationResponse, LocationUpdate
+from ...services.log_writer import enqueue_log
 
 router = APIRouter()
+_location_adapter = TypeAdapter(LocationResponse)
 location_crud = LocationCRUD()
 
 
 @router.get("/", response_model=list[LocationResponse])
-async def list_locations(
+@router.get("", response_model=list[LocationResponse], include_in_schema=False)
+def list_locations(
     skip: int = Query(0, ge=0, description="Number of locations to skip"),
     limit: int = Query(100, ge=1, le=500, description="Number of locations to return"),
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
 ):
     """List all locations with pagination"""
-    locations = location_crud.get_multi(db, skip=skip, limit=limit)
-    return locations
+    cache_key = page_cache.key("locations", skip, limit)
+    body = page_cache.get(cache_key)
+    if body is None:
+        body = dump_json_array(
+            _location_adapter, location_crud.iter_multi(db, skip=skip, limit=limit)
+        )
+        # Hand the pooled connection back before the response is sent
+        db.close()
+        page_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
 
 
 @router.post("/", response_model=LocationResponse)
-async def create_location(
+@router.post("", response_model=LocationResponse, include_in_schema=False)
+def create_location(
     location: LocationCreate,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role("manager")),
 ):
     """Create a new location"""
-    # Check if location with same name already exists
-    existing_location = location_crud.get_by_name(db, name=location.name)
-    if existing_location:
+    # Duplicate-name check and insert in one statement
+    db_location = location_crud.create_if_unique(
+        db,
+        obj_in={**location.model_dump(), "created_by": current_user.id, "is_active": True},
+        unique_field="name",
+    )
+    if db_location is None:
         raise HTTPException(
             status_code=400,
             detail=f"Location with name '{location.name}' already exists",
         )
-
-    db_location = location_crud.create(db, obj_in=location, created_by_id=current_user.id)
     # Log creation
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"Location created: {db_location.name} (ID: {db_location.id})",
         "level": "INFO",
@@ -51,12 +66,12 @@ async def create_location(
         "function": "create_location",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return db_location
 
 
 @router.get("/search", response_model=list[LocationResponse])
-async def search_locations(
+def search_locations(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0, description="Number of locations to skip"),
     limit: int = Query(100, ge=1, le=500, description="Number of locations to return"),
@@ -65,11 +80,12 @@ async def search_locations(
 ):
     """Search locations by name or description"""
     locations = location_crud.search(db, query=q, skip=skip, limit=limit)
+    db.close()
     return locations
 
 
 @router.get("/{location_id}", response_model=LocationResponse)
-async def get_location(
+def get_location(
     location_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
@@ -82,7 +98,7 @@ async def get_location(
 
 
 @router.put("/{location_id}", response_model=LocationResponse)
-async def update_location(
+def update_location(
     location_id: int,
     location_update: LocationUpdate,
     db: Session = Depends(get_db),
@@ -93,25 +109,30 @@ async def update_location(
     if not db_location:
         raise HTTPException(status_code=404, detail="Location not found")
 
-    # Check if updating name would conflict with existing location
-    if location_update.name and location_update.name != db_location.name:
-        existing_location = location_crud.get_by_name(db, name=location_update.name)
-        if existing_location and existing_location.id != location_id:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Location with name '{location_update.name}' already exists",
-            )
-
-    # Compare changes BEFORE update
-    changes = {}
+    # Compare changes BEFORE update; a PUT that changes nothing writes nothing
     update_data = location_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        old_value = getattr(db_location, field, None)
-        if value != old_value:
-            changes[field] = {"old": old_value, "new": value}
-    updated_location = location_crud.update(db, db_obj=db_location, obj_in=location_update)
+    old = {field: getattr(db_location, field, None) for field in update_data}
+    changes = {
+        field: {"old": old[field], "new": value}
+        for field, value in update_data.items()
+        if value != old[field]
+    }
+    if not changes:
+        return db_location
+
+    # The name uniqueness check runs inside the UPDATE itself
+    updated_location = location_crud.update_if_unique(
+        db,
+        db_obj=db_location,
+        obj_in={field: change["new"] for field, change in changes.items()},
+        unique_field="name",
+    )
+    if updated_location is None:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Location with name '{location_update.name}' already exists",
+        )
     # Log update
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"Location updated: {updated_location.name} (ID: {updated_location.id})",
         "level": "INFO",
@@ -120,12 +141,12 @@ async def update_location(
         "user_id": current_user.id,
         "extra_data": {"changes": changes},
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return updated_location
 
 
 @router.delete("/{location_id}")
-async def delete_location(
+def delete_location(
     location_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role("admin")),
@@ -138,7 +159,6 @@ async def delete_location(
     # TODO: Check if location has any items before deleting
     location_crud.remove(db, id=location_id)
     # Log deletion
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"Location deleted: {db_location.name} (ID: {db_location.id})",
         "level": "INFO",
@@ -146,12 +166,12 @@ async def delete_location(
         "function": "delete_location",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return {"message": "Location deleted successfully"}
 
 
 @router.get("/name/{name}", response_model=LocationResponse)
-async def get_location_by_name(
+def get_location_by_name(
     name: str, db: Session = Depends(get_db), current_user=Depends(require_user_role())
 ):
     """Get a location by name"""
@@ -8,6 +8,7 @@ router = APIRouter()
 
 
 @router.get("/")
+@router.get("", include_in_schema=False)
 async def get_logs():
     """Get application logs from in-memory store"""
     return {"message": "Logs endpoint - to be implemented"}
@@ -9,7 +9,7 @@ from fastapi import APIRouter, BackgroundTasks, Depends
 from sqlalchemy.orm import Session
 
 from ...core.security import get_current_user_optional, require_user_role
-from ...crud.crud import SKUCRUD, ItemCRUD, LogEntryCRUD
+from ...crud.crud import SKUCRUD, ItemCRUD
 from ...db.database import get_db
 from ...models.models import SKU, User
 from ...schemas.schemas import (
@@ -20,13 +20,13 @@ from ...schemas.schemas import (
     ScanRequest,
     ScanResponse,
 )
+from ...services.log_writer import enqueue_log
 from ...services.upc_background import UNKNOWN_PRODUCT_NAME, fetch_and_update_item
 from ...services.upc_lookup import upc_lookup_service
 
 router = APIRouter()
 item_crud = ItemCRUD()
 sku_crud = SKUCRUD()
-log_crud = LogEntryCRUD()
 
 DEFAULT_SCANNER_STATE = {
     "current_mode": "add",
@@ -106,7 +106,7 @@ COMMAND_HANDLERS = {
 
 
 @router.post("/scan", response_model=ScanResponse)
-async def scanner_scan(
+def scanner_scan(
     scan_request: ScanRequest,
     background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
@@ -154,8 +154,13 @@ async def scanner_scan(
     mode = state.get("current_mode", "add")
     location_id = state.get("current_location_id") or scan_request.location_hint
 
-    # Look up item by UPC
-    item = item_crud.get_by_upc(db, upc=upc)
+    # Look up item by UPC. Lookup mode and scans without a location return the
+    # SKU list unchanged, so load it with the item in the same query.
+    returns_current_skus = mode == "lookup" or not location_id
+    if returns_current_skus:
+        item = item_crud.get_by_upc_with_skus(db, upc=upc)
+    else:
+        item = item_crud.get_by_upc(db, upc=upc)
 
     if not item:
         # UPC not found locally
@@ -172,9 +177,9 @@ async def scanner_scan(
             )
 
             if current_user:
-                log_crud.create(
+                enqueue_log(
                     db,
-                    obj_in={
+                    {
                         "level": "INFO",
                         "message": f"Unknown UPC scanned, stub item created: {item.id} (UPC: {upc})",
                         "module": "scanner",
@@ -203,11 +208,11 @@ async def scanner_scan(
     if upc_lookup_service.is_available() and not item.uda_fetched and item.upc:
         background_tasks.add_task(fetch_and_update_item, item.upc, item.id)
 
-    # Mode-aware SKU handling
-    skus = sku_crud.get_by_item(db, item_id=item.id)
+    # Mode-aware SKU handling; mutating modes load SKUs once, after the write
     suggested: list[str] = []
 
     if mode == "lookup":
+        skus = item.skus
         return ScanResponse(
             success=True,
             message=f"Found: {item.name}",
@@ -220,6 +225,7 @@ async def scanner_scan(
 
     if not location_id:
         suggested.append("Set a location first — scan a set_location command QR")
+        skus = item.skus
         return ScanResponse(
             success=True,
             message=f"Found: {item.name} (no location set)",
@@ -292,9 +298,9 @@ async def scanner_scan(
     skus = sku_crud.get_by_item(db, item_id=item.id)
 
     if current_user:
-        log_crud.create(
+        enqueue_log(
             db,
-            obj_in={
+            {
                 "level": "INFO",
                 "message": f"Item scanned: {item.name} (UPC: {upc}, mode: {mode})",
                 "module": "scanner",
@@ -324,16 +330,18 @@ async def scanner_scan(
 async def scanner_status(scanner_id: str, current_user=Depends(require_user_role())):
     """Get scanner status and state."""
     state = _get_scanner_state(current_user)
+    # Every scan already records its time in the user's scanner state
+    last_scan = state.get("last_scan_timestamp")
     return ScannerStatus(
         scanner_id=scanner_id,
         is_associated=bool(state.get("associated_ui_id")),
         associated_user=str(current_user.id),
-        last_seen=datetime.now(),
+        last_seen=datetime.fromisoformat(last_scan) if last_scan else None,
     )
 
 
 @router.post("/reset/{scanner_id}")
-async def reset_scanner_state(
+def reset_scanner_state(
     scanner_id: str, current_user=Depends(require_user_role()), db: Session = Depends(get_db)
 ):
     """Reset scanner state to defaults."""
@@ -365,26 +373,27 @@ async def generate_command_qr(
 
 
 @router.post("/lookup/{upc}", response_model=ScanResponse)
-async def lookup_upc(
-    upc: str, db: Session = Depends(get_db), current_user=Depends(require_user_role())
-):
+def lookup_upc(upc: str, db: Session = Depends(get_db), current_user=Depends(require_user_role())):
     """Look up item by UPC without scanner (manual lookup)."""
-    item = item_crud.get_by_upc(db, upc=upc)
+    item = item_crud.get_by_upc_with_skus(db, upc=upc)
     if not item:
         return ScanResponse(success=False, message=f"Unknown UPC: {upc}", item=None, skus=[])
 
-    skus = sku_crud.get_by_item(db, item_id=item.id)
+    # Build the response before the log commit expires the loaded item
+    response = ScanResponse(
+        success=True, message=f"Found item: {item.name}", item=item, skus=item.skus
+    )
 
-    log_crud.create(
+    enqueue_log(
         db,
-        obj_in={
+        {
             "level": "INFO",
             "message": f"Manual UPC lookup: {item.name} (UPC: {upc})",
             "module": "scanner",
             "function": "lookup_upc",
             "user_id": current_user.id,
-            "extra_data": {"upc": upc, "item_id": item.id},
+            "extra_data": {"upc": response.item.upc, "item_id": response.item.id},
         },
     )
 
-    return ScanResponse(success=True, message=f"Found item: {item.name}", item=item, skus=skus)
+    return response
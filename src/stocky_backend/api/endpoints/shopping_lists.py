@@ -2,16 +2,17 @@
 Shopping Lists management endpoints
 """
 
-import json
+import functools
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from pydantic_core import from_json
 from sqlalchemy.orm import Session
 
 from ...core.security import get_current_active_user
-from ...crud.crud import item as item_crud
 from ...crud.crud import shopping_list
 from ...db.database import get_db
-from ...models.models import User
+from ...models.models import ShoppingList, User, UserRole
 from ...schemas.schemas import (
     PaginatedShoppingListLogsResponse,
     PaginatedShoppingListsResponse,
@@ -20,54 +21,137 @@ from ...schemas.schemas import (
     ShoppingListItemCreate,
     ShoppingListItemResponse,
     ShoppingListItemUpdate,
-    ShoppingListLogResponse,
     ShoppingListResponse,
-    ShoppingListSummary,
     ShoppingListUpdate,
 )
 
 router = APIRouter()
+_lists_page_adapter = TypeAdapter(PaginatedShoppingListsResponse)
+_logs_page_adapter = TypeAdapter(PaginatedShoppingListLogsResponse)
+
+
+def _parse_details(details: str | None) -> dict | None:
+    """Decode a stored log ``details`` string with pydantic-core's JSON parser.
+
+    Log pages can run to a thousand rows, and from_json is several times
+    faster than json.loads per row. Text that is not valid JSON is returned
+    under ``raw``.
+    """
+    if not details:
+        return None
+    try:
+        return from_json(details)
+    except ValueError:
+        return {"raw": details}
+
+
+def _json_page(adapter: TypeAdapter, page: dict) -> Response:
+    """Validate and encode a page with its prebuilt adapter in one pass.
+
+    Returning a Response skips FastAPI's response_model round trip through
+    Python objects; the response_model stays on the route for the schema.
+    """
+    body = adapter.dump_json(adapter.validate_python(page))
+    return Response(content=body, media_type="application/json")
+
+
+def _require_modifiable(
+    shopping_list_obj: ShoppingList, current_user: User, action: str = "modify"
+) -> None:
+    """403 unless the user may change the list (public, or their own)"""
+    if not shopping_list.can_modify_list(shopping_list_obj, current_user):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=f"You don't have permission to {action} this shopping list",
+        )
+
+
+# Cached so routes asking for the same action share one dependency
+@functools.cache
+def modifiable_list(action: str = "modify"):
+    """Dependency factory loading a list the current user may change (404, then 403)"""
+
+    def load_list(
+        list_id: int,
+        db: Session = Depends(get_db),
+        current_user: User = Depends(get_current_active_user),
+    ) -> ShoppingList:
+        shopping_list_obj = shopping_list.get_by_id_if_accessible(db, list_id, current_user)
+        if not shopping_list_obj:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Shopping list not found or access denied",
+            )
+        _require_modifiable(shopping_list_obj, current_user, action)
+        return shopping_list_obj
+
+    return load_list
+
+
+def _list_fields(shopping_list_obj: ShoppingList) -> dict:
+    """Fields shared by the list summary and detail responses.
+
+    Handlers return plain dicts (with ORM objects nested) so FastAPI
+    validates each response against its response_model exactly once.
+    """
+    return {
+        "id": shopping_list_obj.id,
+        "name": shopping_list_obj.name,
+        "is_public": shopping_list_obj.is_public,
+        "creator": shopping_list_obj.creator,
+        "created_at": shopping_list_obj.created_at,
+        "updated_at": shopping_list_obj.updated_at,
+    }
+
+
+def _list_response(db: Session, shopping_list_obj: ShoppingList) -> dict:
+    """Detail response for a list with its active items."""
+    items = shopping_list.get_active_items(db, shopping_list_obj.id)
+    return {**_list_fields(shopping_list_obj), "items": items}
 
 
 @router.get("/", response_model=PaginatedShoppingListsResponse)
-async def list_shopping_lists(
+@router.get("", response_model=PaginatedShoppingListsResponse, include_in_schema=False)
+def list_shopping_lists(
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
     include_deleted: bool = Query(False, description="Include deleted lists (admin only)"),
+    cursor: int | None = Query(None, description="Return lists after this ID (next_cursor)"),
+    include_total: bool = Query(True, description="Count all accessible lists"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """List shopping lists accessible to the current user (public + own private)"""
     # Only admins can see deleted lists
-    if include_deleted and current_user.role != "admin":
+    if include_deleted and current_user.role != UserRole.ADMIN:
         include_deleted = False
 
     lists, total = shopping_list.get_accessible_lists(
-        db, current_user, skip=skip, limit=limit, include_deleted=include_deleted
+        db,
+        current_user,
+        skip=skip,
+        limit=limit,
+        include_deleted=include_deleted,
+        after_id=cursor,
+        include_total=include_total,
     )
 
-    # Convert to summary format with item count
-    summaries = []
-    for shopping_list_obj in lists:
-        # Count active items
-        item_count = sum(1 for item in shopping_list_obj.items if not item.is_deleted)
-
-        summary = ShoppingListSummary(
-            id=shopping_list_obj.id,
-            name=shopping_list_obj.name,
-            is_public=shopping_list_obj.is_public,
-            creator=shopping_list_obj.creator,
-            item_count=item_count,
-            created_at=shopping_list_obj.created_at,
-            updated_at=shopping_list_obj.updated_at,
-        )
-        summaries.append(summary)
-
-    return PaginatedShoppingListsResponse(items=summaries, total=total, skip=skip, limit=limit)
+    summaries = [
+        {**_list_fields(shopping_list_obj), "item_count": item_count}
+        for shopping_list_obj, item_count in lists
+    ]
+    page = {
+        "items": summaries,
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": summaries[-1]["id"] if len(summaries) == limit else None,
+    }
+    return _json_page(_lists_page_adapter, page)
 
 
 @router.get("/{list_id}", response_model=ShoppingListResponse)
-async def get_shopping_list(
+def get_shopping_list(
     list_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
@@ -80,32 +164,17 @@ async def get_shopping_list(
             detail="Shopping list not found or access denied",
         )
 
-    # Get active items with full item details
-    active_items = []
-    for list_item in shopping_list_obj.items:
-        if not list_item.is_deleted:
-            item_response = ShoppingListItemResponse(
-                id=list_item.id,
-                item=list_item.item,
-                quantity=list_item.quantity,
-                created_at=list_item.created_at,
-                updated_at=list_item.updated_at,
-            )
-            active_items.append(item_response)
-
-    return ShoppingListResponse(
-        id=shopping_list_obj.id,
-        name=shopping_list_obj.name,
-        is_public=shopping_list_obj.is_public,
-        creator=shopping_list_obj.creator,
-        items=active_items,
-        created_at=shopping_list_obj.created_at,
-        updated_at=shopping_list_obj.updated_at,
-    )
+    return _list_response(db, shopping_list_obj)
 
 
 @router.post("/", response_model=ShoppingListResponse, status_code=status.HTTP_201_CREATED)
-async def create_shopping_list(
+@router.post(
+    "",
+    response_model=ShoppingListResponse,
+    status_code=status.HTTP_201_CREATED,
+    include_in_schema=False,
+)
+def create_shopping_list(
     list_data: ShoppingListCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
@@ -113,86 +182,30 @@ async def create_shopping_list(
     """Create a new shopping list"""
     shopping_list_obj = shopping_list.create(db, list_data, current_user)
 
-    return ShoppingListResponse(
-        id=shopping_list_obj.id,
-        name=shopping_list_obj.name,
-        is_public=shopping_list_obj.is_public,
-        creator=shopping_list_obj.creator,
-        items=[],  # New list has no items
-        created_at=shopping_list_obj.created_at,
-        updated_at=shopping_list_obj.updated_at,
-    )
+    # New list has no items
+    return {**_list_fields(shopping_list_obj), "items": []}
 
 
 @router.put("/{list_id}", response_model=ShoppingListResponse)
-async def update_shopping_list(
-    list_id: int,
+def update_shopping_list(
     list_data: ShoppingListUpdate,
+    shopping_list_obj: ShoppingList = Depends(modifiable_list()),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Update shopping list metadata (name, visibility)"""
-    shopping_list_obj = shopping_list.get_by_id_if_accessible(db, list_id, current_user)
-    if not shopping_list_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Shopping list not found or access denied",
-        )
-
-    # Check if user can modify this list
-    if not shopping_list.can_modify_list(shopping_list_obj, current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to modify this shopping list",
-        )
-
     updated_list = shopping_list.update(db, shopping_list_obj, list_data, current_user)
 
-    # Get active items for response
-    active_items = []
-    for list_item in updated_list.items:
-        if not list_item.is_deleted:
-            item_response = ShoppingListItemResponse(
-                id=list_item.id,
-                item=list_item.item,
-                quantity=list_item.quantity,
-                created_at=list_item.created_at,
-                updated_at=list_item.updated_at,
-            )
-            active_items.append(item_response)
-
-    return ShoppingListResponse(
-        id=updated_list.id,
-        name=updated_list.name,
-        is_public=updated_list.is_public,
-        creator=updated_list.creator,
-        items=active_items,
-        created_at=updated_list.created_at,
-        updated_at=updated_list.updated_at,
-    )
+    return _list_response(db, updated_list)
 
 
 @router.delete("/{list_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_shopping_list(
-    list_id: int,
+def delete_shopping_list(
+    shopping_list_obj: ShoppingList = Depends(modifiable_list("delete")),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Delete (soft delete) a shopping list"""
-    shopping_list_obj = shopping_list.get_by_id_if_accessible(db, list_id, current_user)
-    if not shopping_list_obj:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Shopping list not found or access denied",
-        )
-
-    # Check if user can modify this list
-    if not shopping_list.can_modify_list(shopping_list_obj, current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to delete this shopping list",
-        )
-
     shopping_list.remove(db, shopping_list_obj, current_user)
     return None
 
@@ -202,7 +215,7 @@ async def delete_shopping_list(
     response_model=ShoppingListResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def duplicate_shopping_list(
+def duplicate_shopping_list(
     list_id: int,
     duplicate_data: ShoppingListDuplicate,
     db: Session = Depends(get_db),
@@ -218,28 +231,7 @@ async def duplicate_shopping_list(
 
     duplicated_list = shopping_list.duplicate(db, source_list, duplicate_data, current_user)
 
-    # Get items for response
-    active_items = []
-    for list_item in duplicated_list.items:
-        if not list_item.is_deleted:
-            item_response = ShoppingListItemResponse(
-                id=list_item.id,
-                item=list_item.item,
-                quantity=list_item.quantity,
-                created_at=list_item.created_at,
-                updated_at=list_item.updated_at,
-            )
-            active_items.append(item_response)
-
-    return ShoppingListResponse(
-        id=duplicated_list.id,
-        name=duplicated_list.name,
-        is_public=duplicated_list.is_public,
-        creator=duplicated_list.creator,
-        items=active_items,
-        created_at=duplicated_list.created_at,
-        updated_at=duplicated_list.updated_at,
-    )
+    return _list_response(db, duplicated_list)
 
 
 @router.post(
@@ -247,48 +239,40 @@ async def duplicate_shopping_list(
     response_model=ShoppingListItemResponse,
     status_code=status.HTTP_201_CREATED,
 )
-async def add_item_to_shopping_list(
+def add_item_to_shopping_list(
     list_id: int,
     item_data: ShoppingListItemCreate,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Add an item to a shopping list"""
-    shopping_list_obj = shopping_list.get_by_id_if_accessible(db, list_id, current_user)
-    if not shopping_list_obj:
+    # The list and the item come back from one SELECT
+    row = shopping_list.get_accessible_with_item(db, list_id, item_data.item_id, current_user)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shopping list not found or access denied",
         )
+    shopping_list_obj, item_obj = row
 
-    # Check if user can modify this list
-    if not shopping_list.can_modify_list(shopping_list_obj, current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to modify this shopping list",
-        )
+    _require_modifiable(shopping_list_obj, current_user)
 
     # Verify that the item exists
-    item_obj = item_crud.get(db, item_data.item_id)
     if not item_obj:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Item not found")
 
     try:
-        list_item = shopping_list.add_item(db, shopping_list_obj, item_data, current_user)
+        list_item = shopping_list.add_item(
+            db, shopping_list_obj, item_data, current_user, item=item_obj
+        )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
 
-    return ShoppingListItemResponse(
-        id=list_item.id,
-        item=list_item.item,
-        quantity=list_item.quantity,
-        created_at=list_item.created_at,
-        updated_at=list_item.updated_at,
-    )
+    return list_item
 
 
 @router.put("/{list_id}/items/{item_id}", response_model=ShoppingListItemResponse)
-async def update_item_in_shopping_list(
+def update_item_in_shopping_list(
     list_id: int,
     item_id: int,
     quantity_data: ShoppingListItemUpdate,
@@ -296,22 +280,17 @@ async def update_item_in_shopping_list(
     current_user: User = Depends(get_current_active_user),
 ):
     """Update the quantity of an item in a shopping list"""
-    shopping_list_obj = shopping_list.get_by_id_if_accessible(db, list_id, current_user)
-    if not shopping_list_obj:
+    # The list and its entry for item_id come back from one SELECT
+    row = shopping_list.get_accessible_with_list_item(db, list_id, item_id, current_user)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shopping list not found or access denied",
         )
+    shopping_list_obj, list_item = row
 
-    # Check if user can modify this list
-    if not shopping_list.can_modify_list(shopping_list_obj, current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to modify this shopping list",
-        )
+    _require_modifiable(shopping_list_obj, current_user)
 
-    # Get the list item
-    list_item = shopping_list.get_list_item(db, list_id, item_id)
     if not list_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -322,39 +301,28 @@ async def update_item_in_shopping_list(
         db, list_item, quantity_data.quantity, current_user
     )
 
-    return ShoppingListItemResponse(
-        id=updated_item.id,
-        item=updated_item.item,
-        quantity=updated_item.quantity,
-        created_at=updated_item.created_at,
-        updated_at=updated_item.updated_at,
-    )
+    return updated_item
 
 
 @router.delete("/{list_id}/items/{item_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def remove_item_from_shopping_list(
+def remove_item_from_shopping_list(
     list_id: int,
     item_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
     """Remove an item from a shopping list"""
-    shopping_list_obj = shopping_list.get_by_id_if_accessible(db, list_id, current_user)
-    if not shopping_list_obj:
+    # The list and its entry for item_id come back from one SELECT
+    row = shopping_list.get_accessible_with_list_item(db, list_id, item_id, current_user)
+    if not row:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Shopping list not found or access denied",
         )
+    shopping_list_obj, list_item = row
 
-    # Check if user can modify this list
-    if not shopping_list.can_modify_list(shopping_list_obj, current_user):
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="You don't have permission to modify this shopping list",
-        )
+    _require_modifiable(shopping_list_obj, current_user)
 
-    # Get the list item
-    list_item = shopping_list.get_list_item(db, list_id, item_id)
     if not list_item:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -366,11 +334,13 @@ async def remove_item_from_shopping_list(
 
 
 @router.get("/{list_id}/logs", response_model=PaginatedShoppingListLogsResponse)
-async def get_shopping_list_logs(
+def get_shopping_list_logs(
     list_id: int,
     skip: int = Query(0, ge=0, description="Number of items to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Number of items to return"),
     action_type: str | None = Query(None, description="Filter by action type"),
+    cursor: int | None = Query(None, description="Return logs older than this ID (next_cursor)"),
+    include_total: bool = Query(True, description="Count all matching logs"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
 ):
@@ -383,28 +353,29 @@ async def get_shopping_list_logs(
         )
 
     logs, total = shopping_list.get_logs(
-        db, list_id, skip=skip, limit=limit, action_type=action_type
+        db,
+        list_id,
+        skip=skip,
+        limit=limit,
+        action_type=action_type,
+        before_id=cursor,
+        include_total=include_total,
     )
 
-    # Convert logs to response format
-    log_responses = []
-    for log in logs:
-        details = None
-        if log.details:
-            try:
-                details = json.loads(log.details)
-            except json.JSONDecodeError:
-                details = {"raw": log.details}
-
-        log_response = ShoppingListLogResponse(
-            id=log.id,
-            action_type=log.action_type,
-            user=log.user,
-            details=details,
-            timestamp=log.timestamp,
-        )
-        log_responses.append(log_response)
-
-    return PaginatedShoppingListLogsResponse(
-        items=log_responses, total=total, skip=skip, limit=limit
-    )
+    page = {
+        "items": [
+            {
+                "id": log.id,
+                "action_type": log.action_type,
+                "user": log.user,
+                "details": _parse_details(log.details),
+                "timestamp": log.timestamp,
+            }
+            for log in logs
+        ],
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "next_cursor": logs[-1].id if len(logs) == limit else None,
+    }
+    return _json_page(_logs_page_adapter, page)
@@ -2,60 +2,95 @@
 SKU (inventory) management endpoints
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 
+from ...core.cache import dump_json_array, page_cache
 from ...core.security import require_user_role
-from ...crud.crud import SKUCRUD, LogEntryCRUD
+from ...crud.crud import SKUCRUD
 from ...db.database import get_db
 from ...schemas.schemas import SKUCreate, SKUQuantityUpdate, SKUResponse, SKUUpdate
+from ...services.log_writer import enqueue_log
 
 router = APIRouter()
+_sku_adapter = TypeAdapter(SKUResponse)
 sku_crud = SKUCRUD()
 
 
+def _sku_page(
+    db: Session,
+    *,
+    skip: int,
+    limit: int,
+    location_id: int | None = None,
+    item_id: int | None = None,
+    low_stock: bool = False,
+    cursor: int | None = None,
+) -> Response:
+    """A page of SKUs, served from the list cache when the skus table hasn't changed."""
+    cache_key = page_cache.key("skus", skip, limit, location_id, item_id, low_stock, cursor)
+    body = page_cache.get(cache_key)
+    if body is None:
+        page = {"skip": skip, "limit": limit, "after_id": cursor}
+        if location_id:
+            skus = sku_crud.get_by_location(db, location_id=location_id, **page)
+        elif item_id:
+            skus = sku_crud.get_by_item(db, item_id=item_id, **page)
+        elif low_stock:
+            skus = sku_crud.get_low_stock(db, **page)
+        else:
+            skus = sku_crud.get_multi(db, **page)
+        body = dump_json_array(_sku_adapter, skus)
+        page_cache.set(cache_key, body)
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("/", response_model=list[SKUResponse])
-async def list_skus(
+@router.get("", response_model=list[SKUResponse], include_in_schema=False)
+def list_skus(
     skip: int = Query(0, ge=0, description="Number of SKUs to skip"),
     limit: int = Query(100, ge=1, le=500, description="Number of SKUs to return"),
     location_id: int = Query(None, description="Filter by location ID"),
     item_id: int = Query(None, description="Filter by item ID"),
     low_stock: bool = Query(False, description="Only show low stock items"),
+    cursor: int | None = Query(None, description="Return SKUs after this ID (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
 ):
     """List all SKUs (inventory items) with filtering options"""
-    if location_id:
-        skus = sku_crud.get_by_location(db, location_id=location_id, skip=skip, limit=limit)
-    elif item_id:
-        skus = sku_crud.get_by_item(db, item_id=item_id, skip=skip, limit=limit)
-    elif low_stock:
-        skus = sku_crud.get_low_stock(db, skip=skip, limit=limit)
-    else:
-        skus = sku_crud.get_multi(db, skip=skip, limit=limit)
-    return skus
+    return _sku_page(
+        db,
+        skip=skip,
+        limit=limit,
+        location_id=location_id,
+        item_id=item_id,
+        low_stock=low_stock,
+        cursor=cursor,
+    )
 
 
 @router.post("/", response_model=SKUResponse)
-async def create_sku(
+@router.post("", response_model=SKUResponse, include_in_schema=False)
+def create_sku(
     sku: SKUCreate,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role("user")),
 ):
     """Create a new SKU"""
-    # Check if SKU already exists for this item/location combination
-    existing_sku = sku_crud.get_by_item_location(
-        db, item_id=sku.item_id, location_id=sku.location_id
+    # Check for an active SKU at this item/location and insert in one statement
+    db_sku = sku_crud.create_if_unique(
+        db,
+        obj_in={**sku.model_dump(), "created_by": current_user.id, "is_active": True},
+        unique_field=("item_id", "location_id"),
+        active_only=True,
     )
-    if existing_sku:
+    if db_sku is None:
         raise HTTPException(
             status_code=400,
             detail=f"SKU already exists for item {sku.item_id} at location {sku.location_id}",
         )
-
-    db_sku = sku_crud.create(db, obj_in=sku, created_by_id=current_user.id)
     # Log creation
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"SKU created: Item {db_sku.item_id} at Location {db_sku.location_id} (ID: {db_sku.id})",
         "level": "INFO",
@@ -63,25 +98,26 @@ async def create_sku(
         "function": "create_sku",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return db_sku
 
 
 @router.get("/search", response_model=list[SKUResponse])
-async def search_skus(
+def search_skus(
     q: str = Query(..., min_length=1, description="Search query"),
     skip: int = Query(0, ge=0, description="Number of SKUs to skip"),
     limit: int = Query(100, ge=1, le=500, description="Number of SKUs to return"),
+    cursor: int | None = Query(None, description="Return SKUs after this ID (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
 ):
     """Search SKUs by item name, location name, or UPC"""
-    skus = sku_crud.search(db, query=q, skip=skip, limit=limit)
-    return skus
+    skus = sku_crud.search(db, query=q, skip=skip, limit=limit, after_id=cursor)
+    return Response(content=dump_json_array(_sku_adapter, skus), media_type="application/json")
 
 
 @router.get("/{sku_id}", response_model=SKUResponse)
-async def get_sku(
+def get_sku(
     sku_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
@@ -94,7 +130,7 @@ async def get_sku(
 
 
 @router.put("/{sku_id}", response_model=SKUResponse)
-async def update_sku(
+def update_sku(
     sku_id: int,
     sku_update: SKUUpdate,
     db: Session = Depends(get_db),
@@ -114,7 +150,6 @@ async def update_sku(
             changes[field] = {"old": old_value, "new": value}
     updated_sku = sku_crud.update(db, db_obj=db_sku, obj_in=sku_update)
     # Log update
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"SKU updated: Item {updated_sku.item_id} at Location {updated_sku.location_id} (ID: {updated_sku.id})",
         "level": "INFO",
@@ -123,12 +158,12 @@ async def update_sku(
         "user_id": current_user.id,
         "extra_data": {"changes": changes},
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return updated_sku
 
 
 @router.put("/{sku_id}/quantity", response_model=SKUResponse)
-async def update_quantity(
+def update_quantity(
     sku_id: int,
     quantity_update: SKUQuantityUpdate,
     db: Session = Depends(get_db),
@@ -139,18 +174,17 @@ async def update_quantity(
     if not db_sku:
         raise HTTPException(status_code=404, detail="SKU not found")
 
-    # Compare quantity BEFORE update
-    changes = {}
     old_quantity = db_sku.quantity
     new_quantity = quantity_update.quantity
-    if old_quantity != new_quantity:
-        changes["quantity"] = {"old": old_quantity, "new": new_quantity}
+    if old_quantity == new_quantity:
+        # Nothing to write or log
+        return db_sku
+    changes = {"quantity": {"old": old_quantity, "new": new_quantity}}
 
     # Update only the quantity field
     updated_sku = sku_crud.update_quantity(db, sku_id=sku_id, new_quantity=new_quantity)
 
     # Log quantity update
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"SKU quantity updated: Item {updated_sku.item_id} at Location {updated_sku.location_id} (ID: {updated_sku.id})",
         "level": "INFO",
@@ -159,12 +193,12 @@ async def update_quantity(
         "user_id": current_user.id,
         "extra_data": {"changes": changes},
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return updated_sku
 
 
 @router.delete("/{sku_id}")
-async def delete_sku(
+def delete_sku(
     sku_id: int,
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role("manager")),
@@ -176,7 +210,6 @@ async def delete_sku(
 
     sku_crud.remove(db, id=sku_id)
     # Log deletion
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"SKU deleted: Item {db_sku.item_id} at Location {db_sku.location_id} (ID: {db_sku.id})",
         "level": "INFO",
@@ -184,17 +217,17 @@ async def delete_sku(
         "function": "delete_sku",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
+    enqueue_log(db, log_entry)
     return {"message": "SKU deleted successfully"}
 
 
 @router.get("/low-stock", response_model=list[SKUResponse])
-async def get_low_stock_items(
+def get_low_stock_items(
     skip: int = Query(0, ge=0, description="Number of SKUs to skip"),
     limit: int = Query(100, ge=1, le=500, description="Number of SKUs to return"),
+    cursor: int | None = Query(None, description="Return SKUs after this ID (keyset pagination)"),
     db: Session = Depends(get_db),
     current_user=Depends(require_user_role()),
 ):
     """Get items with low stock (quantity <= min_quantity)"""
-    skus = sku_crud.get_low_stock(db, skip=skip, limit=limit)
-    return skus
+    return _sku_page(db, skip=skip, limit=limit, low_stock=True, cursor=cursor)
@@ -2,57 +2,62 @@
 User management endpoints
 """
 
-from datetime import datetime
-
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from pydantic import TypeAdapter
+from sqlalchemy import inspect
 from sqlalchemy.orm import Session
 
+from ...core.cache import dump_json_array
 from ...core.security import get_current_active_user, require_admin
-from ...crud.crud import LogEntryCRUD, UserCRUD
+from ...crud.crud import UserCRUD
 from ...db.database import get_db
-from ...models.models import User
+from ...models.models import User, UserRole
 from ...schemas.schemas import UserCreate, UserResponse, UserUpdate
+from ...services.log_writer import enqueue_log
 
 router = APIRouter()
+_user_adapter = TypeAdapter(UserResponse)
+# The columns UserResponse serializes; list_users loads no others
+_user_response_columns = tuple(getattr(User, field) for field in UserResponse.model_fields)
 user_crud = UserCRUD()
 
 
 @router.get("/", response_model=list[UserResponse])
-async def list_users(
+@router.get("", response_model=list[UserResponse], include_in_schema=False)
+def list_users(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """List all users (admin only)"""
-    users = user_crud.get_multi(db, skip=skip, limit=limit)
-    return [UserResponse.model_validate(user) for user in users]
+    users = user_crud.get_multi(db, skip=skip, limit=limit, columns=_user_response_columns)
+    return Response(content=dump_json_array(_user_adapter, users), media_type="application/json")
 
 
 @router.post("/", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
-async def create_user(
+@router.post(
+    "", response_model=UserResponse, status_code=status.HTTP_201_CREATED, include_in_schema=False
+)
+def create_user(
     user_data: UserCreate,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
 ):
     """Create a new user (admin only)"""
 
-    # Check if username already exists
-    existing_user = user_crud.get_by_username(db, user_data.username)
-    if existing_user:
+    # Check username and email availability in one query
+    conflicts = user_crud.get_conflicts(db, username=user_data.username, email=user_data.email)
+    if "username" in conflicts:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST, detail="Username already exists"
         )
-
-    # Check if email already exists
-    existing_email = user_crud.get_by_email(db, user_data.email)
-    if existing_email:
+    if "email" in conflicts:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
 
-    # Create user
+    # Create user (hashes the password; this handler already runs in the threadpool)
     user = user_crud.create(db, obj_in=user_data)
     # Log creation
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"User created: {user.username} (ID: {user.id})",
         "level": "INFO",
@@ -60,12 +65,12 @@ async def create_user(
         "function": "create_user",
         "user_id": current_user.id,
     }
-    log_crud.create(db, obj_in=log_entry)
-    return UserResponse.model_validate(user)
+    enqueue_log(db, log_entry)
+    return user
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(
+def get_user(
     user_id: int,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_active_user),
@@ -73,7 +78,7 @@ async def get_user(
     """Get user by ID (admin or own profile)"""
 
     # Check if user can access this profile
-    if current_user.role != "admin" and current_user.id != user_id:
+    if current_user.role != UserRole.ADMIN and current_user.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied. Admin role required or access own data only.",
@@ -83,11 +88,11 @@ async def get_user(
     if not user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    return UserResponse.model_validate(user)
+    return user
 
 
 @router.put("/{user_id}", response_model=UserResponse)
-async def update_user(
+def update_user(
     user_id: int,
     user_update: UserUpdate,
     db: Session = Depends(get_db),
@@ -96,50 +101,52 @@ async def update_user(
     """Update user (admin or own profile)"""
 
     # Check if user can update this profile
-    if current_user.role != "admin" and current_user.id != user_id:
+    if current_user.role != UserRole.ADMIN and current_user.id != user_id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Access denied. Admin role required or access own data only.",
         )
 
     # Only admins can change roles
-    if user_update.role is not None and current_user.role != "admin":
+    if user_update.role is not None and current_user.role != UserRole.ADMIN:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Only admins can change user roles",
         )
 
-    # Check if new username is taken (if being changed)
-    if user_update.username is not None:
-        existing_user = user_crud.get_by_username(db, user_update.username)
-        if existing_user and existing_user.id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Username already exists",
-            )
-
-    # Check if new email is taken (if being changed)
-    if user_update.email is not None:
-        existing_email = user_crud.get_by_email(db, user_update.email)
-        if existing_email and existing_email.id != user_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists"
-            )
-
-    # Update user
+    # Check whether a new username or email is taken by someone else, in one query
+    conflicts = user_crud.get_conflicts(
+        db, username=user_update.username, email=user_update.email, exclude_id=user_id
+    )
+    if "username" in conflicts:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Username already exists",
+        )
+    if "email" in conflicts:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already exists")
+
+    # The current values are needed for the change log (served from the
+    # identity map when users edit themselves)
     db_user = user_crud.get(db, user_id)
     if not db_user:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
-    # Compare changes BEFORE update
-    changes = {}
-    update_data = user_update.model_dump(exclude_unset=True)
-    for field, value in update_data.items():
-        old_value = getattr(db_user, field, None)
-        if value != old_value:
-            changes[field] = {"old": old_value, "new": value}
-    updated_user = user_crud.update(db, db_obj=db_user, obj_in=user_update)
+    # Compare changes BEFORE update, against the loaded column values rather
+    # than through the instrumented attributes
+    current = inspect(db_user).dict
+    changes = {
+        field: {"old": current.get(field), "new": value}
+        for field, value in user_update.model_dump(exclude_unset=True).items()
+        if current.get(field) != value
+    }
+    if not changes:
+        return db_user
+
+    # Write only the changed fields and read the row back in the same statement
+    updated_user = user_crud.update_returning(
+        db, user_id, {field: change["new"] for field, change in changes.items()}
+    )
     # Log update
-    log_crud = LogEntryCRUD()
     log_entry = {
         "message": f"User updated: {updated_user.username} (ID: {updated_user.id})",
         "level": "INFO",
@@ -148,12 +155,12 @@ async def update_user(
         "user_id": current_user.id,
         "extra_data": {"changes": changes},
     }
-    log_crud.create(db, obj_in=log_entry)
-    return UserResponse.model_validate(updated_user)
+    enqueue_log(db, log_entry)
+    return updated_user
 
 
 @router.delete("/{user_id}")
-async def delete_user(
+def delete_user(
     user_id: int,
     current_user: User = Depends(require_admin),
     db: Session = Depends(get_db),
@@ -166,19 +173,15 @@ async def delete_user(
             detail="Cannot deactivate your own account",
         )
 
-    user = user_crud.get(db, user_id)
-    if not user:
+    # One UPDATE ... RETURNING; updated_at is set by the column's onupdate
+    username = user_crud.deactivate(db, user_id)
+    if username is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
 
-    user.is_active = False
-    user.updated_at = datetime.now()  # type: ignore[attr-defined]
-    db.commit()
-
-    log_crud = LogEntryCRUD()
-    log_crud.create(
+    enqueue_log(
         db,
-        obj_in={
-            "message": f"User deactivated: {user.username} (ID: {user.id})",
+        {
+            "message": f"User deactivated: {username} (ID: {user_id})",
             "level": "INFO",
             "module": "users",
             "function": "delete_user",
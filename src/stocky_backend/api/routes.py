@@ -2,7 +2,10 @@
 Main API router that includes all endpoint modules
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from ..core.security import require_admin
+from ..db.database import engine
 
 from .endpoints import (
     alerts,
@@ -20,20 +23,32 @@ from .endpoints import (
 # Create main API router
 api_router = APIRouter()
 
+# Endpoint routers with their URL prefix and OpenAPI tag
+ENDPOINT_ROUTERS = (
+    (auth.router, "/auth", "authentication"),
+    (users.router, "/users", "users"),
+    (items.router, "/items", "items"),
+    (locations.router, "/locations", "locations"),
+    (skus.router, "/skus", "inventory"),
+    (scanner.router, "/scanner", "scanner"),
+    (logs.router, "/logs", "logs"),
+    (alerts.router, "/alerts", "alerts"),
+    (backup.router, "/backup", "backup"),
+    (shopping_lists.router, "/shopping-lists", "shopping-lists"),
+)
+
 # Include all endpoint routers
-api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
-api_router.include_router(users.router, prefix="/users", tags=["users"])
-api_router.include_router(items.router, prefix="/items", tags=["items"])
-api_router.include_router(locations.router, prefix="/locations", tags=["locations"])
-api_router.include_router(skus.router, prefix="/skus", tags=["inventory"])
-api_router.include_router(scanner.router, prefix="/scanner", tags=["scanner"])
-api_router.include_router(logs.router, prefix="/logs", tags=["logs"])
-api_router.include_router(alerts.router, prefix="/alerts", tags=["alerts"])
-api_router.include_router(backup.router, prefix="/backup", tags=["backup"])
-api_router.include_router(shopping_lists.router, prefix="/shopping-lists", tags=["shopping-lists"])
+for endpoint_router, prefix, tag in ENDPOINT_ROUTERS:
+    api_router.include_router(endpoint_router, prefix=prefix, tags=[tag])
 
 
 @api_router.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {"status": "healthy", "service": "stocky-backend"}
+
+
+@api_router.get("/metrics")
+async def metrics(current_user=Depends(require_admin)):
+    """Runtime metrics (admin only): database connection pool usage"""
+    return {"db_pool": engine.pool.status()}
@@ -2,8 +2,14 @@
 Authentication utilities for session-based auth and password hashing.
 """
 
+import base64
+import functools
+import hashlib
+import hmac
 import secrets
-import string
+import threading
+import time
+from collections import OrderedDict
 
 from fastapi import Request, Response
 
@@ -14,43 +20,129 @@ from ..core.config import settings
 import bcrypt as _bcrypt
 
 
+def _password_bytes(password: str) -> bytes:
+    """Encode a password for bcrypt, which only uses the first 72 bytes"""
+    return password.encode("utf-8")[:72]
+
+
 class BcryptContext:
     """Direct bcrypt wrapper to avoid passlib compatibility issues"""
 
     @staticmethod
     def hash(password: str) -> str:
         """Hash a password using bcrypt"""
-        # Encode password and ensure it's not longer than 72 bytes
-        password_bytes = password.encode("utf-8")
-        if len(password_bytes) > 72:
-            password_bytes = password_bytes[:72]
-
-        # Generate salt and hash
-        salt = _bcrypt.gensalt(rounds=12)
-        hashed_bytes = _bcrypt.hashpw(password_bytes, salt)
-        return hashed_bytes.decode("utf-8")
+        salt = _bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)
+        return _bcrypt.hashpw(_password_bytes(password), salt).decode("utf-8")
 
     @staticmethod
     def verify(password: str, hashed: str) -> bool:
         """Verify a password against its hash"""
         try:
-            # Encode password and ensure it's not longer than 72 bytes
-            password_bytes = password.encode("utf-8")
-            if len(password_bytes) > 72:
-                password_bytes = password_bytes[:72]
-
-            # Verify password
-            hashed_bytes = hashed.encode("utf-8")
-            return _bcrypt.checkpw(password_bytes, hashed_bytes)
-        except Exception:
+            return _bcrypt.checkpw(_password_bytes(password), hashed.encode("utf-8"))
+        except (TypeError, ValueError):
+            # Malformed or non-bcrypt hash
+            return False
+
+    @staticmethod
+    def needs_rehash(hashed: str) -> bool:
+        """Whether a hash was made with a different cost than BCRYPT_ROUNDS"""
+        # bcrypt hashes look like $2b$<cost>$<salt+digest>
+        try:
+            return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+        except (IndexError, ValueError):
             return False
 
 
-pwd_context = BcryptContext()
+class ScryptContext:
+    """Memory-hard scrypt from the standard library (hashlib, backed by OpenSSL)"""
+
+    PREFIX = "$scrypt$"
+    # N = 2**SCRYPT_COST; block size and parallelism are fixed
+    BLOCK_SIZE = 8
+    PARALLELISM = 1
+
+    @staticmethod
+    def _derive(password: str, salt: bytes, cost: int, r: int, p: int) -> bytes:
+        n = 1 << cost
+        # scrypt needs 128 * r * N * p bytes; leave headroom over OpenSSL's default cap
+        return hashlib.scrypt(
+            password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n * p, dklen=32
+        )
+
+    @classmethod
+    def _parse(cls, hashed: str) -> tuple[int, int, int, bytes, bytes]:
+        # $scrypt$ln=<cost>,r=<r>,p=<p>$<salt>$<digest>
+        _, _, params, salt, digest = hashed.split("$")
+        values = dict(param.split("=") for param in params.split(","))
+        return (
+            int(values["ln"]),
+            int(values["r"]),
+            int(values["p"]),
+            base64.b64decode(salt),
+            base64.b64decode(digest),
+        )
+
+    @classmethod
+    def hash(cls, password: str) -> str:
+        """Hash a password using scrypt with a random 16-byte salt"""
+        cost, r, p = settings.SCRYPT_COST, cls.BLOCK_SIZE, cls.PARALLELISM
+        salt = secrets.token_bytes(16)
+        digest = cls._derive(password, salt, cost, r, p)
+        encoded_salt = base64.b64encode(salt).decode("ascii")
+        encoded_digest = base64.b64encode(digest).decode("ascii")
+        return f"{cls.PREFIX}ln={cost},r={r},p={p}${encoded_salt}${encoded_digest}"
+
+    @classmethod
+    def verify(cls, password: str, hashed: str) -> bool:
+        """Verify a password against its hash"""
+        try:
+            cost, r, p, salt, digest = cls._parse(hashed)
+            return hmac.compare_digest(cls._derive(password, salt, cost, r, p), digest)
+        except (KeyError, OverflowError, TypeError, ValueError):
+            # Malformed hash or parameters OpenSSL rejects
+            return False
+
+    @classmethod
+    def needs_rehash(cls, hashed: str) -> bool:
+        """Whether a hash was made with parameters other than the configured ones"""
+        try:
+            cost, r, p, _, _ = cls._parse(hashed)
+        except (KeyError, ValueError):
+            return False
+        return (cost, r, p) != (settings.SCRYPT_COST, cls.BLOCK_SIZE, cls.PARALLELISM)
+
+
+class PasswordContext:
+    """Hashes with PASSWORD_HASH_SCHEME and verifies bcrypt and scrypt hashes alike.
+
+    A stored hash in the other scheme (or at another cost) is flagged by
+    needs_rehash, so switching schemes migrates users as they log in.
+    """
+
+    schemes = {"bcrypt": BcryptContext(), "scrypt": ScryptContext()}
+
+    @staticmethod
+    def scheme_of(hashed: str) -> str:
+        return "scrypt" if hashed.startswith(ScryptContext.PREFIX) else "bcrypt"
+
+    def hash(self, password: str) -> str:
+        return self.schemes[settings.PASSWORD_HASH_SCHEME].hash(password)
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return self.schemes[self.scheme_of(hashed)].verify(password, hashed)
+
+    def needs_rehash(self, hashed: str) -> bool:
+        scheme = self.scheme_of(hashed)
+        if scheme != settings.PASSWORD_HASH_SCHEME:
+            return True
+        return self.schemes[scheme].needs_rehash(hashed)
+
+
+pwd_context = PasswordContext()
 
 
 def hash_password(password: str) -> str:
-    """Hash a password using bcrypt"""
+    """Hash a password with the configured scheme"""
     return pwd_context.hash(password)
 
 
@@ -58,15 +150,77 @@ def hash_password(password: str) -> str:
 get_password_hash = hash_password
 
 
+def password_needs_rehash(hashed_password: str) -> bool:
+    """Check whether a stored hash should be upgraded to the configured scheme and cost"""
+    return pwd_context.needs_rehash(hashed_password)
+
+
+# Successful verifications keyed by HMAC(SECRET_KEY, hash + password) -> expiry.
+# Only successes are cached, so failed guesses always pay the full bcrypt cost,
+# and a password change produces a new hash (and therefore a new key).
+_verify_cache: OrderedDict[bytes, float] = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _keyed_hmac(secret_key: str) -> hmac.HMAC:
+    """HMAC-SHA256 already keyed with ``secret_key``; callers update a copy"""
+    return hmac.new(secret_key.encode("utf-8"), digestmod=hashlib.sha256)
+
+
+def _verify_cache_key(plain_password: str, hashed_password: str) -> bytes:
+    """Derive a cache key that never exposes the plaintext password"""
+    # Copying the keyed state skips encoding and padding the key on every call
+    mac = _keyed_hmac(settings.SECRET_KEY).copy()
+    mac.update(hashed_password.encode("utf-8") + b"\0" + plain_password.encode("utf-8"))
+    return mac.digest()
+
+
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a password against its hash"""
-    return pwd_context.verify(plain_password, hashed_password)
+    """Verify a password against its hash, reusing recent successful checks"""
+    if not settings.AUTH_VERIFY_CACHE_ENABLED:
+        return pwd_context.verify(plain_password, hashed_password)
+
+    key = _verify_cache_key(plain_password, hashed_password)
+    now = time.monotonic()
+    with _verify_cache_lock:
+        expires_at = _verify_cache.get(key)
+        if expires_at is not None:
+            if expires_at > now:
+                _verify_cache.move_to_end(key)
+                return True
+            del _verify_cache[key]
+
+    if not pwd_context.verify(plain_password, hashed_password):
+        return False
+
+    with _verify_cache_lock:
+        _verify_cache[key] = now + settings.AUTH_VERIFY_CACHE_TTL_SECONDS
+        _verify_cache.move_to_end(key)
+        while len(_verify_cache) > settings.AUTH_VERIFY_CACHE_MAXSIZE:
+            _verify_cache.popitem(last=False)
+    return True
+
+
+@functools.cache
+def _dummy_password_hash() -> str:
+    """Hash of a random secret, computed once with the configured scheme and cost"""
+    return pwd_context.hash(secrets.token_urlsafe(16))
+
+
+def verify_dummy_password(plain_password: str) -> bool:
+    """Spend a real password check for a login that has no usable account.
+
+    Keeps unknown/inactive usernames from answering measurably faster than a
+    wrong password, which would let callers enumerate accounts by timing.
+    """
+    pwd_context.verify(plain_password, _dummy_password_hash())
+    return False
 
 
-def generate_api_key(length: int = 32) -> str:
-    """Generate a secure random API key"""
-    alphabet = string.ascii_letters + string.digits
-    return "".join(secrets.choice(alphabet) for _ in range(length))
+def generate_api_key(nbytes: int = 32) -> str:
+    """Generate a secure random URL-safe API key from ``nbytes`` of entropy"""
+    return secrets.token_urlsafe(nbytes)
 
 
 # ── Session cookie helpers ──────────────────────────────────────────
@@ -0,0 +1,191 @@
+"""
+In-process caches of serialized list pages and authenticated users,
+invalidated when their tables change
+"""
+
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from collections.abc import Callable, Hashable, Iterable
+
+from pydantic import TypeAdapter
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import ORMExecuteState, Session, make_transient_to_detached
+
+from ..models.models import User
+from .config import settings
+
+
+class PageCache:
+    """TTL + LRU cache of JSON response bodies, keyed per table.
+
+    Every key embeds the table's generation number. A committed write to the
+    table drops its pages and bumps the generation, so a page built from
+    data read before the write is never stored. Invalidation is per process:
+    other workers keep serving their copy until it expires.
+    """
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[tuple, tuple[float, bytes]] = OrderedDict()
+        self._generations: defaultdict[str, int] = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def key(self, table: str, *params: Hashable) -> tuple:
+        """Cache key for a page of ``table``; take it before querying"""
+        with self._lock:
+            return (table, self._generations[table], *params)
+
+    def get(self, key: tuple) -> bytes | None:
+        if not settings.LIST_CACHE_ENABLED:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, body = entry
+            if expires_at <= now:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return body
+
+    def set(self, key: tuple, body: bytes) -> None:
+        if not settings.LIST_CACHE_ENABLED:
+            return
+        with self._lock:
+            # Skip pages whose table changed while they were being built
+            if key[1] != self._generations[key[0]]:
+                return
+            self._entries[key] = (time.monotonic() + settings.LIST_CACHE_TTL_SECONDS, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.LIST_CACHE_MAXSIZE:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *tables: str) -> None:
+        """Drop cached pages for ``tables``, or for every table if none are given"""
+        with self._lock:
+            if not tables:
+                tables = tuple(self._generations)
+            for table in tables:
+                self._generations[table] += 1
+            for key in [key for key in self._entries if key[0] in tables]:
+                del self._entries[key]
+
+
+page_cache = PageCache()
+
+
+class UserCache:
+    """TTL + LRU cache of the user behind a session token or API key.
+
+    Entries hold the user's column values rather than an ORM object, and a
+    hit is merged into the request's Session without a SELECT, so handlers
+    can still modify and commit the user. A committed write to users or
+    sessions clears the cache in this process; other workers see a logout,
+    role change or deactivation once their entry expires.
+    """
+
+    # A committed write to either table clears the cache
+    TABLES = frozenset({"users", "sessions"})
+
+    def __init__(self) -> None:
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(kind: str, credential: str) -> str:
+        """Cache key for a credential; only its hash is kept in memory"""
+        return f"{kind}:{hashlib.sha256(credential.encode()).hexdigest()}"
+
+    def lookup(self, db: Session, key: str, load: Callable[[], User | None]) -> User | None:
+        """The cached user for ``key``, or ``load()``'s result, cached if found"""
+        if not settings.AUTH_USER_CACHE_ENABLED:
+            return load()
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= now:
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+            generation = self._generation
+        if entry is not None:
+            user = User(**copy.deepcopy(entry[1]))
+            make_transient_to_detached(user)
+            return db.merge(user, load=False)
+
+        user = load()
+        if user is None:
+            return None
+        values = {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs}
+        with self._lock:
+            # Skip users loaded before a write that cleared the cache
+            if generation != self._generation:
+                return user
+            expires_at = now + settings.AUTH_USER_CACHE_TTL_SECONDS
+            self._entries[key] = (expires_at, copy.deepcopy(values))
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.AUTH_USER_CACHE_MAXSIZE:
+                self._entries.popitem(last=False)
+        return user
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+user_cache = UserCache()
+
+
+def dump_json_array(adapter: TypeAdapter, rows: Iterable) -> bytes:
+    """Serialize ``rows`` to a JSON array one row at a time.
+
+    Each row is encoded as soon as it is read, so neither a list of ORM
+    objects nor a list of response models is held alongside the output.
+    """
+    return b"[" + b",".join(adapter.dump_json(adapter.validate_python(row)) for row in rows) + b"]"
+
+
+_TOUCHED_TABLES = "page_cache_touched_tables"
+
+
+def _touched(session: Session) -> set[str]:
+    return session.info.setdefault(_TOUCHED_TABLES, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flushed_tables(session: Session, flush_context) -> None:
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        if table:
+            _touched(session).add(table)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_bulk_statements(orm_execute_state: ORMExecuteState) -> None:
+    # update(Model) / delete(Model) / insert(Model) run through the session
+    # without going through the flush
+    is_write = orm_execute_state.is_update or orm_execute_state.is_delete
+    if (is_write or orm_execute_state.is_insert) and orm_execute_state.bind_mapper:
+        _touched(orm_execute_state.session).add(orm_execute_state.bind_mapper.local_table.name)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_tables(session: Session) -> None:
+    tables = session.info.pop(_TOUCHED_TABLES, None)
+    if tables:
+        page_cache.invalidate(*tables)
+        if not user_cache.TABLES.isdisjoint(tables):
+            user_cache.clear()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_rolled_back_tables(session: Session) -> None:
+    session.info.pop(_TOUCHED_TABLES, None)
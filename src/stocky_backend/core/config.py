@@ -2,6 +2,9 @@
 Core configuration settings for the Stocky Backend application
 """
 
+from functools import cached_property
+from typing import Literal
+
 from pydantic import field_validator
 from pydantic_settings import BaseSettings
 
@@ -18,6 +21,32 @@ class Settings(BaseSettings):
     # Security settings
     SECRET_KEY: str = "your-secret-key-change-this-in-production"
 
+    # Password hashing cost (bcrypt log2 rounds; 10 is the OWASP minimum, lower
+    # only for tests/CI). Existing hashes are re-hashed to this cost on login.
+    BCRYPT_ROUNDS: int = 10
+
+    # Scheme for new password hashes. scrypt is memory-hard and comes from the
+    # standard library; hashes in either scheme verify, and are re-hashed to
+    # this scheme on the user's next login.
+    PASSWORD_HASH_SCHEME: Literal["bcrypt", "scrypt"] = "bcrypt"
+    # scrypt cost as log2(N); 14 uses 16 MiB per hash
+    SCRYPT_COST: int = 14
+
+    # Short-lived in-process cache of successful password verifications
+    AUTH_VERIFY_CACHE_ENABLED: bool = True
+    AUTH_VERIFY_CACHE_TTL_SECONDS: int = 60
+    AUTH_VERIFY_CACHE_MAXSIZE: int = 4096
+
+    # In-process cache of the user behind a session token or API key
+    AUTH_USER_CACHE_ENABLED: bool = True
+    AUTH_USER_CACHE_TTL_SECONDS: int = 10
+    AUTH_USER_CACHE_MAXSIZE: int = 1024
+
+    # In-process cache of serialized item/location list pages
+    LIST_CACHE_ENABLED: bool = True
+    LIST_CACHE_TTL_SECONDS: int = 30
+    LIST_CACHE_MAXSIZE: int = 256
+
     # Session settings
     SESSION_EXPIRE_HOURS: int = 24  # Standard session lifetime
     PERSISTENT_SESSION_EXPIRE_DAYS: int = 30  # "Remember me" lifetime
@@ -31,6 +60,8 @@ class Settings(BaseSettings):
 
     # Database settings - will be overridden by .env file
     DATABASE_URL: str = "sqlite+pysqlite:///./data/stocky.db"
+    # Run create_all on startup; off by default since `alembic upgrade head` owns the schema
+    AUTO_CREATE_TABLES: bool = False
 
     # CORS settings
     ALLOWED_ORIGINS: str = "http://localhost:3000,http://localhost:5173,http://localhost:8080"
@@ -54,11 +85,12 @@ class Settings(BaseSettings):
             print("WARNING: Using default secret key. Change this in production!")
         return v
 
-    @property
-    def allowed_origins_list(self) -> list[str]:
-        """Convert ALLOWED_ORIGINS string to list for CORS middleware.
+    @cached_property
+    def allowed_origins_list(self) -> tuple[str, ...]:
+        """Convert ALLOWED_ORIGINS string to a tuple for CORS middleware.
 
-        Supports both comma-separated and JSON array formats.
+        Supports both comma-separated and JSON array formats. Parsed on first
+        access; settings are not reloaded while the process runs.
         """
         origins = self.ALLOWED_ORIGINS
         if isinstance(origins, str):
@@ -72,8 +104,8 @@ class Settings(BaseSettings):
                 except json.JSONDecodeError:
                     pass
             if isinstance(origins, str):
-                return [o.strip().strip('"') for o in origins.split(",") if o.strip()]
-        return list(origins) if origins else []
+                return tuple(o.strip().strip('"') for o in origins.split(",") if o.strip())
+        return tuple(origins) if origins else ()
 
     model_config = {"env_file": ".env", "case_sensitive": True}
 
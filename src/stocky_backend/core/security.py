@@ -2,11 +2,14 @@
 Security dependencies for FastAPI authentication and authorization.
 """
 
+import functools
+
 from fastapi import Depends, HTTPException, Request, Security, status
 from fastapi.security import APIKeyHeader
 from sqlalchemy.orm import Session
 
 from ..core.auth import get_session_token_from_cookie
+from ..core.cache import user_cache
 from ..crud.crud import session as session_crud
 from ..db.database import get_db
 from ..models.models import User, UserRole
@@ -15,7 +18,9 @@ from ..models.models import User, UserRole
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
-async def get_current_user_from_session(
+# The lookups below query the database with the sync Session, so they are
+# plain defs: FastAPI runs them in its threadpool, off the event loop.
+def get_current_user_from_session(
     request: Request,
     db: Session = Depends(get_db),
 ) -> User | None:
@@ -23,28 +28,50 @@ async def get_current_user_from_session(
     token = get_session_token_from_cookie(request)
     if not token:
         return None
-    return session_crud.get_user_by_token(db, token)
+    return user_cache.lookup(
+        db, user_cache.key("session", token), lambda: session_crud.get_user_by_token(db, token)
+    )
 
 
-async def get_current_user_from_api_key(
+def get_current_user_from_api_key(
     db: Session = Depends(get_db),
     api_key: str | None = Security(api_key_header),
 ) -> User | None:
     """Get current user from API key header."""
     if not api_key:
         return None
-    user = db.query(User).filter(User.api_key == api_key).first()
+    user = user_cache.lookup(
+        db,
+        user_cache.key("api_key", api_key),
+        lambda: db.query(User).filter(User.api_key == api_key).first(),
+    )
     if user is None or not user.is_active:
         return None
     return user
 
 
+def get_authenticated_user(
+    request: Request,
+    db: Session = Depends(get_db),
+    api_key: str | None = Security(api_key_header),
+) -> User | None:
+    """User behind the session cookie, else behind the API key.
+
+    Both lookups run in this one dependency, so a request takes a single
+    threadpool hop for authentication, and the API key is not looked up
+    when the session already identifies the user. FastAPI resolves it once
+    per request however many dependencies ask for the user.
+    """
+    user = get_current_user_from_session(request, db)
+    if user is None:
+        user = get_current_user_from_api_key(db, api_key)
+    return user
+
+
 async def get_current_user(
-    session_user: User | None = Depends(get_current_user_from_session),
-    api_key_user: User | None = Depends(get_current_user_from_api_key),
+    user: User | None = Depends(get_authenticated_user),
 ) -> User:
     """Get current user from session cookie or API key."""
-    user = session_user or api_key_user
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -66,11 +93,9 @@ async def get_current_active_user(
 
 
 async def get_current_user_optional(
-    session_user: User | None = Depends(get_current_user_from_session),
-    api_key_user: User | None = Depends(get_current_user_from_api_key),
+    user: User | None = Depends(get_authenticated_user),
 ) -> User | None:
     """Get current user if authenticated, but don't require authentication."""
-    user = session_user or api_key_user
     if user and not user.is_active:
         return None
     return user
@@ -78,31 +103,35 @@ async def get_current_user_optional(
 
 def require_roles(allowed_roles: list[UserRole]):
     """Dependency factory to require specific user roles"""
+    # A set lookup per request; the denial message is built once
+    allowed = frozenset(allowed_roles)
+    detail = f"Access denied. Required roles: {[role.value for role in allowed_roles]}"
 
     async def role_checker(
         current_user: User = Depends(get_current_active_user),
     ) -> User:
-        if current_user.role not in allowed_roles:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {[role.value for role in allowed_roles]}",
-            )
+        if current_user.role not in allowed:
+            raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=detail)
         return current_user
 
     return role_checker
 
 
+_ROLE_HIERARCHY = {
+    "user": frozenset([UserRole.ADMIN, UserRole.MEMBER, UserRole.SCANNER, UserRole.READ_ONLY]),
+    "scanner": frozenset([UserRole.ADMIN, UserRole.MEMBER, UserRole.SCANNER]),
+    "member": frozenset([UserRole.ADMIN, UserRole.MEMBER]),
+    "manager": frozenset([UserRole.ADMIN, UserRole.MEMBER]),  # Member is essentially manager
+    "admin": frozenset([UserRole.ADMIN]),
+}
+
+
+# Cached so every route asking for the same role shares one dependency,
+# which FastAPI then resolves once per request
+@functools.cache
 def require_user_role(min_role: str = "user"):
     """Dependency factory to require minimum user role"""
-    role_hierarchy = {
-        "user": [UserRole.ADMIN, UserRole.MEMBER, UserRole.SCANNER, UserRole.READ_ONLY],
-        "scanner": [UserRole.ADMIN, UserRole.MEMBER, UserRole.SCANNER],
-        "member": [UserRole.ADMIN, UserRole.MEMBER],
-        "manager": [UserRole.ADMIN, UserRole.MEMBER],  # Member is essentially manager
-        "admin": [UserRole.ADMIN],
-    }
-
-    allowed_roles = role_hierarchy.get(min_role, [UserRole.ADMIN])
+    allowed_roles = _ROLE_HIERARCHY.get(min_role, frozenset([UserRole.ADMIN]))
 
     async def role_checker(
         current_user: User = Depends(get_current_active_user),
@@ -3,13 +3,26 @@ CRUD operations for database models
 """
 
 import hashlib
+import re
+from collections.abc import Iterator
 from datetime import UTC, datetime
 
 from typing import Any, Generic, TypeVar
 
 from pydantic import BaseModel
-from sqlalchemy import and_, or_
-from sqlalchemy.orm import Session
+from sqlalchemy import and_, bindparam, exists, func, insert, literal, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import (
+    InstrumentedAttribute,
+    Session,
+    aliased,
+    contains_eager,
+    joinedload,
+    load_only,
+    raiseload,
+)
 
 from ..core.auth import hash_password
 from ..core.config import settings
@@ -24,6 +37,7 @@ from ..models.models import (
     ShoppingListItem,
     ShoppingListLog,
     User,
+    search_document,
 )
 from ..schemas.schemas import (
     AlertCreate,
@@ -47,12 +61,39 @@ CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
 
+def _page(query, id_column, *, skip: int, limit: int, after_id: int | None, descending=False):
+    """Order ``query`` by ``id_column`` and cut one page from it.
+
+    With a keyset cursor (``after_id``, the last ID of the previous page) the
+    database seeks to it through the primary-key index instead of reading
+    and discarding ``skip`` rows.
+    """
+    if after_id is not None:
+        query = query.filter(id_column < after_id if descending else id_column > after_id)
+    return query.order_by(id_column.desc() if descending else id_column).offset(skip).limit(limit)
+
+
+def _prefix_tsquery(db: Session, query: str):
+    """Full-text query matching every word of ``query`` as a prefix.
+
+    Returns None off PostgreSQL, or when ``query`` has no words, so callers
+    fall back to LIKE matching.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        return None
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    return func.to_tsquery("english", " & ".join(f"{word}:*" for word in words))
+
+
 class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     def __init__(self, model):
         self.model = model
 
     def get(self, db: Session, id: int) -> ModelType | None:
-        return db.query(self.model).filter(self.model.id == id).first()
+        # Primary-key lookup: answered from the identity map when already loaded
+        return db.get(self.model, id)
 
     def get_multi(self, db: Session, *, skip: int = 0, limit: int = 100) -> list[ModelType]:
         return db.query(self.model).offset(skip).limit(limit).all()
@@ -70,6 +111,40 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    def create_if_unique(
+        self,
+        db: Session,
+        *,
+        obj_in: CreateSchemaType | dict,
+        unique_field: str | tuple[str, ...],
+        active_only: bool = False,
+    ) -> ModelType | None:
+        """Create a row unless another row already has its ``unique_field``.
+
+        ``unique_field`` may be a tuple for a composite key. With
+        ``active_only``, only rows with ``is_active`` set count as taken.
+        The uniqueness check and the write are one INSERT ... SELECT ... WHERE
+        NOT EXISTS ... RETURNING. Returns None when the value is taken.
+        """
+        obj_data = obj_in.model_dump() if hasattr(obj_in, "model_dump") else obj_in
+        columns = self.model.__table__.c
+        fields = (unique_field,) if isinstance(unique_field, str) else unique_field
+        row = select(*(literal(value, columns[key].type) for key, value in obj_data.items()))
+        if all(obj_data.get(field) is not None for field in fields):
+            taken = [columns[field] == obj_data[field] for field in fields]
+            if active_only:
+                taken.append(columns["is_active"])
+            row = row.where(~exists().where(*taken))
+        stmt = insert(self.model).from_select(list(obj_data), row).returning(self.model)
+        try:
+            created = db.scalars(stmt).first()
+        except IntegrityError:
+            # A concurrent insert won the race for a value with a unique index
+            db.rollback()
+            return None
+        db.commit()
+        return created
+
     def update(
         self,
         db: Session,
@@ -89,6 +164,40 @@ class CRUDBase(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         db.refresh(db_obj)
         return db_obj
 
+    def update_if_unique(
+        self,
+        db: Session,
+        *,
+        db_obj: ModelType,
+        obj_in: UpdateSchemaType | dict[str, Any],
+        unique_field: str,
+    ) -> ModelType | None:
+        """Update ``db_obj`` unless another row already has its new ``unique_field``.
+
+        The uniqueness check and the write are one UPDATE ... WHERE NOT EXISTS
+        ... RETURNING. Returns None when the value is taken (or the row is gone).
+        """
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if not update_data:
+            return db_obj
+
+        model = self.model
+        stmt = update(model).where(model.id == db_obj.id).values(**update_data)
+        if update_data.get(unique_field):
+            other = aliased(model)
+            stmt = stmt.where(
+                ~exists().where(
+                    getattr(other, unique_field) == update_data[unique_field],
+                    other.id != model.id,
+                )
+            )
+        updated = db.scalars(stmt.returning(model)).first()
+        db.commit()
+        return updated
+
     def remove(self, db: Session, *, id: int) -> ModelType:
         obj = db.get(self.model, id)
         db.delete(obj)
@@ -106,6 +215,78 @@ class UserCRUD(CRUDBase[User, UserCreate, UserUpdate]):
     def get_by_email(self, db: Session, email: str) -> User | None:
         return db.query(User).filter(User.email == email).first()
 
+    def get_multi(
+        self,
+        db: Session,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        columns: tuple[InstrumentedAttribute, ...] = (),
+    ) -> list[User]:
+        """Users by offset; ``columns`` limits which columns the SELECT loads.
+
+        Columns left out (password hash, API key, scanner state) load on first
+        access.
+        """
+        query = db.query(User)
+        if columns:
+            query = query.options(load_only(*columns))
+        return query.offset(skip).limit(limit).all()
+
+    def get_conflicts(
+        self,
+        db: Session,
+        *,
+        username: str | None = None,
+        email: str | None = None,
+        exclude_id: int | None = None,
+    ) -> set[str]:
+        """Which of ``username`` / ``email`` another user already has.
+
+        One SELECT over both unique indexes instead of a lookup per field.
+        ``exclude_id`` skips the user being updated.
+        """
+        terms = []
+        if username is not None:
+            terms.append(User.username == username)
+        if email is not None:
+            terms.append(User.email == email)
+        if not terms:
+            return set()
+
+        stmt = select(User.username, User.email).where(or_(*terms)).limit(2)
+        if exclude_id is not None:
+            stmt = stmt.where(User.id != exclude_id)
+        conflicts = set()
+        for row in db.execute(stmt):
+            if username is not None and row.username == username:
+                conflicts.add("username")
+            if email is not None and row.email == email:
+                conflicts.add("email")
+        return conflicts
+
+    def update_returning(self, db: Session, user_id: int, values: dict[str, Any]) -> User | None:
+        """Apply ``values`` with one UPDATE ... RETURNING; None if no such user"""
+        # An already-loaded User is refreshed in place from the returned row
+        stmt = update(User).where(User.id == user_id).values(**values).returning(User)
+        user = db.scalars(stmt).first()
+        db.commit()
+        return user
+
+    def deactivate(self, db: Session, user_id: int) -> str | None:
+        """Mark a user inactive in one statement; returns their username, or None if missing"""
+        stmt = (
+            update(User).where(User.id == user_id).values(is_active=False).returning(User.username)
+        )
+        username = db.scalars(stmt).first()
+        db.commit()
+        return username
+
+    def set_api_key(self, db: Session, user_id: int, api_key: str | None) -> None:
+        """Set or clear a user's API key with a single UPDATE (no reload)."""
+        db.execute(update(User).where(User.id == user_id).values(api_key=api_key))
+        db.commit()
+
     def create(self, db: Session, *, obj_in: UserCreate) -> User:
         obj_data = obj_in.model_dump()
         obj_data["hashed_password"] = hash_password(obj_data.pop("password"))
@@ -118,11 +299,26 @@ class UserCRUD(CRUDBase[User, UserCreate, UserUpdate]):
 
 
 class ItemCRUD(CRUDBase[Item, ItemCreate, ItemUpdate]):
+    # Built once: every scan reuses the same statement (and its compiled-cache
+    # entry) against the unique upc index, with only the bound value changing
+    _by_upc_stmt = select(Item).where(Item.upc == bindparam("upc")).limit(1)
+    # Item plus its active SKUs in one round trip; other relationships raise
+    # so serialization can't quietly lazy-load them
+    _by_upc_with_skus_stmt = (
+        select(Item)
+        .where(Item.upc == bindparam("upc"))
+        .options(joinedload(Item.skus.and_(SKU.is_active)), raiseload("*"))
+    )
+
     def __init__(self):
         super().__init__(Item)
 
     def get_by_upc(self, db: Session, upc: str) -> Item | None:
-        return db.query(Item).filter(Item.upc == upc).first()
+        return db.scalars(self._by_upc_stmt, {"upc": upc}).first()
+
+    def get_by_upc_with_skus(self, db: Session, upc: str) -> Item | None:
+        """Get an item by UPC with ``item.skus`` holding only its active SKUs."""
+        return db.scalars(self._by_upc_with_skus_stmt, {"upc": upc}).unique().first()
 
     def get_multi(
         self,
@@ -137,6 +333,13 @@ class ItemCRUD(CRUDBase[Item, ItemCreate, ItemUpdate]):
             query = query.filter(Item.is_active)
         return query.offset(skip).limit(limit).all()
 
+    def iter_multi(
+        self, db: Session, *, skip: int = 0, limit: int = 100, batch_size: int = 100
+    ) -> Iterator[Item]:
+        """Active items like get_multi, fetched from the cursor ``batch_size`` rows at a time."""
+        query = db.query(Item).filter(Item.is_active).offset(skip).limit(limit)
+        return iter(query.yield_per(batch_size))
+
     def create(
         self,
         db: Session,
@@ -160,19 +363,22 @@ class ItemCRUD(CRUDBase[Item, ItemCreate, ItemUpdate]):
         return db_obj
 
     def search(self, db: Session, query: str, skip: int = 0, limit: int = 50) -> list[Item]:
-        search_term = f"%{query}%"
+        tsquery = _prefix_tsquery(db, query)
+        if tsquery is not None:
+            # Served by the ix_items_search GIN index
+            match = search_document(Item.name, Item.description, Item.upc).bool_op("@@")(tsquery)
+        else:
+            search_term = f"%{query}%"
+            match = or_(
+                Item.name.ilike(search_term),
+                Item.description.ilike(search_term),
+                Item.upc.like(search_term),
+            )
+        # ItemResponse has no relationship fields; raise rather than lazy-load per row
         return (
             db.query(Item)
-            .filter(
-                and_(
-                    Item.is_active,
-                    or_(
-                        Item.name.ilike(search_term),
-                        Item.description.ilike(search_term),
-                        Item.upc.like(search_term),
-                    ),
-                )
-            )
+            .options(raiseload("*"))
+            .filter(and_(Item.is_active, match))
             .offset(skip)
             .limit(limit)
             .all()
@@ -199,6 +405,13 @@ class LocationCRUD(CRUDBase[Location, LocationCreate, LocationUpdate]):
             query = query.filter(Location.is_active)
         return query.offset(skip).limit(limit).all()
 
+    def iter_multi(
+        self, db: Session, *, skip: int = 0, limit: int = 100, batch_size: int = 100
+    ) -> Iterator[Location]:
+        """Active locations like get_multi, fetched from the cursor ``batch_size`` rows at a time."""
+        query = db.query(Location).filter(Location.is_active).offset(skip).limit(limit)
+        return iter(query.yield_per(batch_size))
+
     def create(self, db: Session, *, obj_in: LocationCreate, created_by_id: int = 1) -> Location:
         obj_data = obj_in.model_dump()
         obj_data["created_by"] = created_by_id
@@ -210,18 +423,20 @@ class LocationCRUD(CRUDBase[Location, LocationCreate, LocationUpdate]):
         return db_obj
 
     def search(self, db: Session, query: str, skip: int = 0, limit: int = 50) -> list[Location]:
-        search_term = f"%{query}%"
+        tsquery = _prefix_tsquery(db, query)
+        if tsquery is not None:
+            # Served by the ix_locations_search GIN index
+            match = search_document(Location.name, Location.description).bool_op("@@")(tsquery)
+        else:
+            search_term = f"%{query}%"
+            match = or_(
+                Location.name.ilike(search_term),
+                Location.description.ilike(search_term),
+            )
         return (
             db.query(Location)
-            .filter(
-                and_(
-                    Location.is_active,
-                    or_(
-                        Location.name.ilike(search_term),
-                        Location.description.ilike(search_term),
-                    ),
-                )
-            )
+            .options(raiseload("*"))
+            .filter(and_(Location.is_active, match))
             .offset(skip)
             .limit(limit)
             .all()
@@ -232,25 +447,32 @@ class SKUCRUD(CRUDBase[SKU, SKUCreate, SKUUpdate]):
     def __init__(self):
         super().__init__(SKU)
 
-    def get_by_item(self, db: Session, item_id: int, skip: int = 0, limit: int = 100) -> list[SKU]:
-        return (
-            db.query(SKU)
-            .filter(and_(SKU.item_id == item_id, SKU.is_active))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    def get_by_item(
+        self,
+        db: Session,
+        item_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: int | None = None,
+    ) -> list[SKU]:
+        query = db.query(SKU).filter(and_(SKU.item_id == item_id, SKU.is_active))
+        return _page(query, SKU.id, skip=skip, limit=limit, after_id=after_id).all()
+
+    def exists_for_item(self, db: Session, item_id: int) -> bool:
+        """Whether the item has any active SKU, without loading SKU rows."""
+        stmt = select(literal(1)).where(SKU.item_id == item_id, SKU.is_active).limit(1)
+        return db.execute(stmt).scalar() is not None
 
     def get_by_location(
-        self, db: Session, location_id: int, skip: int = 0, limit: int = 100
+        self,
+        db: Session,
+        location_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: int | None = None,
     ) -> list[SKU]:
-        return (
-            db.query(SKU)
-            .filter(and_(SKU.location_id == location_id, SKU.is_active))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = db.query(SKU).filter(and_(SKU.location_id == location_id, SKU.is_active))
+        return _page(query, SKU.id, skip=skip, limit=limit, after_id=after_id).all()
 
     def get_by_item_location(self, db: Session, item_id: int, location_id: int) -> SKU | None:
         return (
@@ -266,15 +488,15 @@ class SKUCRUD(CRUDBase[SKU, SKUCreate, SKUUpdate]):
         )
 
     def get_low_stock(
-        self, db: Session, skip: int = 0, limit: int = 100, threshold: float = 5.0
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        threshold: float = 5.0,
+        after_id: int | None = None,
     ) -> list[SKU]:
-        return (
-            db.query(SKU)
-            .filter(and_(SKU.is_active, SKU.quantity <= threshold))
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+        query = db.query(SKU).filter(and_(SKU.is_active, SKU.quantity <= threshold))
+        return _page(query, SKU.id, skip=skip, limit=limit, after_id=after_id).all()
 
     def get_multi(
         self,
@@ -283,11 +505,12 @@ class SKUCRUD(CRUDBase[SKU, SKUCreate, SKUUpdate]):
         skip: int = 0,
         limit: int = 100,
         include_inactive: bool = False,
+        after_id: int | None = None,
     ) -> list[SKU]:
         query = db.query(SKU)
         if not include_inactive:
             query = query.filter(SKU.is_active)
-        return query.offset(skip).limit(limit).all()
+        return _page(query, SKU.id, skip=skip, limit=limit, after_id=after_id).all()
 
     def create(self, db: Session, *, obj_in: SKUCreate, created_by_id: int = 1) -> SKU:
         obj_data = obj_in.model_dump()
@@ -299,33 +522,46 @@ class SKUCRUD(CRUDBase[SKU, SKUCreate, SKUUpdate]):
         db.refresh(db_obj)
         return db_obj
 
-    def search(self, db: Session, query: str, skip: int = 0, limit: int = 50) -> list[SKU]:
+    def search(
+        self,
+        db: Session,
+        query: str,
+        skip: int = 0,
+        limit: int = 50,
+        after_id: int | None = None,
+    ) -> list[SKU]:
         search_term = f"%{query}%"
-        return (
+        # Matching items and locations are found first (trigram indexes on
+        # PostgreSQL), then their SKUs through ix_skus_item_id /
+        # ix_skus_location_id, rather than filtering every joined SKU row
+        matching_items = select(Item.id).where(
+            or_(Item.name.ilike(search_term), Item.upc.like(search_term))
+        )
+        matching_locations = select(Location.id).where(Location.name.ilike(search_term))
+        matches = (
             db.query(SKU)
-            .join(Item)
-            .join(Location)
+            .join(SKU.item)
+            .join(SKU.location)
+            # The joins already select the item and location rows; populate
+            # sku.item / sku.location from them instead of a SELECT per SKU
+            .options(contains_eager(SKU.item), contains_eager(SKU.location), raiseload("*"))
             .filter(
                 and_(
                     SKU.is_active,
                     or_(
-                        Item.name.ilike(search_term),
-                        Item.upc.like(search_term),
-                        Location.name.ilike(search_term),
+                        SKU.item_id.in_(matching_items),
+                        SKU.location_id.in_(matching_locations),
                     ),
                 )
             )
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return _page(matches, SKU.id, skip=skip, limit=limit, after_id=after_id).all()
 
     def update_quantity(self, db: Session, sku_id: int, new_quantity: int) -> SKU | None:
-        sku = db.query(SKU).filter(SKU.id == sku_id).first()
-        if sku:
-            sku.quantity = new_quantity
-            db.commit()
-            db.refresh(sku)
+        # One UPDATE ... RETURNING; an already-loaded SKU is refreshed in place
+        stmt = update(SKU).where(SKU.id == sku_id).values(quantity=new_quantity).returning(SKU)
+        sku = db.scalars(stmt).first()
+        db.commit()
         return sku
 
 
@@ -360,6 +596,12 @@ class LogEntryCRUD(CRUDBase[LogEntry, None, None]):
     def __init__(self):
         super().__init__(LogEntry)
 
+    def create(self, db: Session, *, obj_in: dict) -> None:
+        # Log rows are write-only here: a Core INSERT skips the unit of work
+        # and the refresh SELECT that CRUDBase.create would issue
+        db.execute(insert(LogEntry), [obj_in])
+        db.commit()
+
     def get_by_user(
         self, db: Session, user_id: int, skip: int = 0, limit: int = 100
     ) -> list[LogEntry]:
@@ -396,8 +638,13 @@ class ShoppingListCRUD(CRUDBase[ShoppingList, ShoppingListCreate, ShoppingListUp
         skip: int = 0,
         limit: int = 100,
         include_deleted: bool = False,
-    ) -> tuple[list[ShoppingList], int]:
-        """Get lists accessible to user (public + own private)"""
+        after_id: int | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[tuple[ShoppingList, int]], int | None]:
+        """Get lists accessible to user (public + own private), each with its active item count.
+
+        ``total`` is None unless ``include_total``; counting reads every match.
+        """
         query = db.query(ShoppingList).filter(
             or_(ShoppingList.is_public, ShoppingList.creator_id == current_user.id)
         )
@@ -405,28 +652,79 @@ class ShoppingListCRUD(CRUDBase[ShoppingList, ShoppingListCreate, ShoppingListUp
         if not include_deleted:
             query = query.filter(~ShoppingList.is_deleted)
 
-        total = query.count()
-        lists = query.offset(skip).limit(limit).all()
-        return lists, total
+        total = query.count() if include_total else None
+        # Count items in SQL and load creators in the same SELECT, rather than
+        # lazy-loading .items and .creator once per list
+        item_count = (
+            select(func.count())
+            .where(
+                ShoppingListItem.shopping_list_id == ShoppingList.id,
+                ~ShoppingListItem.is_deleted,
+            )
+            .scalar_subquery()
+        )
+        query = query.add_columns(item_count).options(joinedload(ShoppingList.creator))
+        rows = _page(query, ShoppingList.id, skip=skip, limit=limit, after_id=after_id).all()
+        return [tuple(row) for row in rows], total
+
+    @staticmethod
+    def _accessible(list_id: int, current_user: User):
+        """Filter for a live list the user can see (public or owner)"""
+        return and_(
+            ShoppingList.id == list_id,
+            ~ShoppingList.is_deleted,
+            or_(
+                ShoppingList.is_public,
+                ShoppingList.creator_id == current_user.id,
+            ),
+        )
 
     def get_by_id_if_accessible(
         self, db: Session, list_id: int, current_user: User
     ) -> ShoppingList | None:
         """Get list if user has access (public or owner)"""
-        return (
-            db.query(ShoppingList)
-            .filter(
+        return db.query(ShoppingList).filter(self._accessible(list_id, current_user)).first()
+
+    def get_accessible_with_item(
+        self, db: Session, list_id: int, item_id: int, current_user: User
+    ) -> tuple[ShoppingList, Item | None] | None:
+        """Accessible list and the Item ``item_id`` (None if missing), in one SELECT"""
+        row = (
+            db.query(ShoppingList, Item)
+            .outerjoin(Item, Item.id == item_id)
+            .filter(self._accessible(list_id, current_user))
+            .first()
+        )
+        return tuple(row) if row else None
+
+    def get_accessible_with_list_item(
+        self, db: Session, list_id: int, item_id: int, current_user: User
+    ) -> tuple[ShoppingList, ShoppingListItem | None] | None:
+        """Accessible list and its live entry for ``item_id`` (None if absent), in one SELECT"""
+        row = (
+            db.query(ShoppingList, ShoppingListItem)
+            .outerjoin(
+                ShoppingListItem,
                 and_(
-                    ShoppingList.id == list_id,
-                    ~ShoppingList.is_deleted,
-                    or_(
-                        ShoppingList.is_public,
-                        ShoppingList.creator_id == current_user.id,
-                    ),
-                )
+                    ShoppingListItem.shopping_list_id == ShoppingList.id,
+                    ShoppingListItem.item_id == item_id,
+                    ~ShoppingListItem.is_deleted,
+                ),
             )
+            .filter(self._accessible(list_id, current_user))
             .first()
         )
+        return tuple(row) if row else None
+
+    def get_active_items(self, db: Session, list_id: int) -> list[ShoppingListItem]:
+        """Non-deleted items of a list, with their Item loaded in the same SELECT"""
+        return (
+            db.query(ShoppingListItem)
+            .options(joinedload(ShoppingListItem.item))
+            .filter(ShoppingListItem.shopping_list_id == list_id, ~ShoppingListItem.is_deleted)
+            .order_by(ShoppingListItem.id)
+            .all()
+        )
 
     def can_modify_list(self, shopping_list: ShoppingList, current_user: User) -> bool:
         """Check if user can modify the list (collaborative editing rules)"""
@@ -517,17 +815,18 @@ class ShoppingListCRUD(CRUDBase[ShoppingList, ShoppingListCreate, ShoppingListUp
         db.commit()
         db.refresh(new_list)
 
-        # Copy all active items
-        for source_item in source_list.items:
-            if not source_item.is_deleted:
-                new_item = ShoppingListItem(
-                    shopping_list_id=new_list.id,
-                    item_id=source_item.item_id,
-                    quantity=source_item.quantity,
-                    is_deleted=False,
-                )
-                db.add(new_item)
-
+        # Copy all active items with one INSERT ... SELECT; deleted rows never leave the database
+        active_items = select(
+            literal(new_list.id),
+            ShoppingListItem.item_id,
+            ShoppingListItem.quantity,
+            literal(False),
+        ).where(ShoppingListItem.shopping_list_id == source_list.id, ~ShoppingListItem.is_deleted)
+        db.execute(
+            insert(ShoppingListItem).from_select(
+                ["shopping_list_id", "item_id", "quantity", "is_deleted"], active_items
+            )
+        )
         db.commit()
 
         # Log the duplication
@@ -551,58 +850,41 @@ class ShoppingListCRUD(CRUDBase[ShoppingList, ShoppingListCreate, ShoppingListUp
         shopping_list: ShoppingList,
         item_data: ShoppingListItemCreate,
         current_user: User,
+        item: Item | None = None,
     ) -> ShoppingListItem:
-        """Add item to shopping list with logging"""
-        # Check if item already exists in list (including soft-deleted)
-        existing_item = (
-            db.query(ShoppingListItem)
-            .filter(
-                and_(
-                    ShoppingListItem.shopping_list_id == shopping_list.id,
-                    ShoppingListItem.item_id == item_data.item_id,
-                )
-            )
-            .first()
+        """Add item to shopping list with logging.
+
+        One INSERT ... ON CONFLICT inserts the row or restores a soft-deleted
+        one. A live row for the same item is left alone, RETURNING comes back
+        empty, and ValueError is raised. ``item`` is only used for the log
+        entry's name; pass it if already loaded to skip looking it up.
+        """
+        insert_for_dialect = (
+            pg_insert if db.get_bind().dialect.name == "postgresql" else sqlite_insert
         )
-
-        if existing_item:
-            if existing_item.is_deleted:
-                # Restore the soft-deleted item
-                existing_item.is_deleted = False
-                existing_item.quantity = item_data.quantity
-                db.commit()
-                db.refresh(existing_item)
-
-                # Log as item_added
-                item_obj = db.query(Item).filter(Item.id == item_data.item_id).first()
-                self.log_action(
-                    db,
-                    shopping_list,
-                    current_user,
-                    "item_added",
-                    {
-                        "item_id": item_data.item_id,
-                        "item_name": item_obj.name if item_obj else "Unknown",
-                        "quantity": item_data.quantity,
-                    },
-                )
-
-                return existing_item
-            else:
-                raise ValueError("Item already exists in shopping list")
-
-        # Create new item
-        obj_data = item_data.model_dump()
-        obj_data["shopping_list_id"] = shopping_list.id
-        obj_data["is_deleted"] = False
-
-        db_obj = ShoppingListItem(**obj_data)
-        db.add(db_obj)
+        stmt = insert_for_dialect(ShoppingListItem).values(
+            shopping_list_id=shopping_list.id,
+            item_id=item_data.item_id,
+            quantity=item_data.quantity,
+            is_deleted=False,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[ShoppingListItem.shopping_list_id, ShoppingListItem.item_id],
+            set_={
+                "quantity": stmt.excluded.quantity,
+                "is_deleted": False,
+                "updated_at": func.now(),
+            },
+            where=ShoppingListItem.is_deleted,
+        ).returning(ShoppingListItem)
+        db_obj = db.scalars(stmt, execution_options={"populate_existing": True}).first()
+        if db_obj is None:
+            raise ValueError("Item already exists in shopping list")
         db.commit()
-        db.refresh(db_obj)
 
         # Log the addition
-        item_obj = db.query(Item).filter(Item.id == item_data.item_id).first()
+        if item is None:
+            item = db.get(Item, item_data.item_id)
         self.log_action(
             db,
             shopping_list,
@@ -610,7 +892,7 @@ class ShoppingListCRUD(CRUDBase[ShoppingList, ShoppingListCreate, ShoppingListUp
             "item_added",
             {
                 "item_id": item_data.item_id,
-                "item_name": item_obj.name if item_obj else "Unknown",
+                "item_name": item.name if item else "Unknown",
                 "quantity": item_data.quantity,
             },
         )
@@ -697,19 +979,25 @@ class ShoppingListCRUD(CRUDBase[ShoppingList, ShoppingListCreate, ShoppingListUp
         skip: int = 0,
         limit: int = 100,
         action_type: str | None = None,
-    ) -> tuple[list[ShoppingListLog], int]:
-        """Get logs for a shopping list"""
-        query = (
-            db.query(ShoppingListLog)
-            .filter(ShoppingListLog.shopping_list_id == shopping_list_id)
-            .order_by(ShoppingListLog.timestamp.desc())
+        before_id: int | None = None,
+        include_total: bool = True,
+    ) -> tuple[list[ShoppingListLog], int | None]:
+        """Get logs for a shopping list, newest first.
+
+        Logs are appended in time order, so descending ID is descending
+        timestamp and ``before_id`` works as a keyset cursor.
+        """
+        query = db.query(ShoppingListLog).filter(
+            ShoppingListLog.shopping_list_id == shopping_list_id
         )
 
         if action_type:
             query = query.filter(ShoppingListLog.action_type == action_type)
 
-        total = query.count()
-        logs = query.offset(skip).limit(limit).all()
+        total = query.count() if include_total else None
+        logs = _page(
+            query, ShoppingListLog.id, skip=skip, limit=limit, after_id=before_id, descending=True
+        ).all()
         return logs, total
 
     def log_action(
@@ -786,9 +1074,17 @@ class SessionCRUD:
     def get_user_by_token(self, db: Session, raw_token: str) -> User | None:
         """Look up a user by raw session token. Returns None if expired or not found."""
         token_hash = self._hash_token(raw_token)
-        session = db.query(SessionModel).filter(SessionModel.token_hash == token_hash).first()
-        if not session:
+        # Fetch the session and its user in one round trip; this runs on every
+        # cookie-authenticated request
+        row = (
+            db.query(SessionModel, User)
+            .join(User, User.id == SessionModel.user_id)
+            .filter(SessionModel.token_hash == token_hash)
+            .first()
+        )
+        if not row:
             return None
+        session, user = row
         # Compare with UTC, but handle SQLite's naive datetimes
         now = datetime.now(UTC)
         expires = session.expires_at
@@ -798,7 +1094,7 @@ class SessionCRUD:
             db.delete(session)
             db.commit()
             return None
-        return db.query(User).filter(User.id == session.user_id).first()
+        return user
 
     def delete(self, db: Session, raw_token: str) -> bool:
         """Delete a session by raw token. Returns True if found and deleted."""
@@ -818,17 +1114,13 @@ class SessionCRUD:
 
     def cleanup_expired(self, db: Session) -> int:
         """Delete all expired sessions. Returns count deleted."""
-        now = datetime.now(UTC)
-        # Handle SQLite naive datetimes by comparing with now.replace(tzinfo=None)
-        sessions = db.query(SessionModel).all()
-        count = 0
-        for s in sessions:
-            expires = s.expires_at
-            if expires.tzinfo is None:
-                expires = expires.replace(tzinfo=UTC)
-            if expires < now:
-                db.delete(s)
-                count += 1
+        # expires_at is stored as UTC (naive on SQLite, where the bound value's
+        # offset is dropped too), so the database can compare it in one DELETE
+        count = (
+            db.query(SessionModel)
+            .filter(SessionModel.expires_at < datetime.now(UTC))
+            .delete(synchronize_session=False)
+        )
         db.commit()
         return count
 
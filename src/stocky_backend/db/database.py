@@ -2,10 +2,12 @@
 Database configuration and session management
 """
 
+import os
 from collections.abc import Generator
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import Session, declarative_base, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from ..core.config import settings
 
@@ -16,11 +18,42 @@ if db_url.startswith("sqlite:///"):
     # Convert to explicit synchronous SQLite driver
     db_url = db_url.replace("sqlite:///", "sqlite+pysqlite:///")
 
+url = make_url(db_url)
+
+# Batch executemany INSERTs (bulk_insert_mappings, restores) into multi-row VALUES pages
+engine_options: dict = {"insertmanyvalues_page_size": 1000}
+connect_args: dict = {}
+
+# Connection pool sizing — enough connections that requests waiting on
+# bcrypt or the UPC service don't starve the rest of the app
+if url.get_backend_name() == "sqlite":
+    connect_args["check_same_thread"] = False
+    if url.database in (None, "", ":memory:"):
+        # An in-memory DB lives inside one connection; share it across threads
+        engine_options["poolclass"] = StaticPool
+    else:
+        engine_options["pool_size"] = 20
+        engine_options["max_overflow"] = 10
+else:
+    engine_options["pool_size"] = min(32, (os.cpu_count() or 1) * 2)
+    engine_options["max_overflow"] = 20
+    # Replace server connections before idle timeouts/proxies can cut them,
+    # and check out-of-band drops on checkout rather than failing a request
+    engine_options["pool_recycle"] = 1800
+    engine_options["pool_pre_ping"] = True
+
+if url.get_driver_name() == "psycopg2":
+    # TCP keepalives so dead peers are noticed while a connection sits in the pool
+    connect_args.update(keepalives=1, keepalives_idle=30)
+    # Use psycopg2's execute_batch for executemany UPDATE/DELETE as well
+    engine_options["executemany_mode"] = "values_plus_batch"
+    engine_options["executemany_batch_page_size"] = 500
+
 engine = create_engine(
     db_url,
-    # SQLite specific settings
-    connect_args={"check_same_thread": False} if "sqlite" in db_url else {},
+    connect_args=connect_args,
     echo=settings.DEBUG,  # Log SQL queries in debug mode
+    **engine_options,
 )
 
 # Create session factory
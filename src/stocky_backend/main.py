@@ -9,18 +9,27 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from . import __version__
+from .api.endpoints.auth import warm_up_response_models
 from .api.routes import api_router
 from .core.config import settings
 from .db.database import Base, engine
+from .services.log_writer import start_log_writer, stop_log_writer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Manage application lifespan"""
-    # Startup
-    Base.metadata.create_all(bind=engine)
+    # Startup: schema is owned by Alembic; create_all is an opt-in dev shortcut
+    if settings.AUTO_CREATE_TABLES:
+        Base.metadata.create_all(bind=engine)
+    warm_up_response_models()
+    # FastAPI caches the schema on first build; build it now so the first
+    # /openapi.json request doesn't wait on a walk of every route and model
+    app.openapi()
+    log_writer = await start_log_writer()
     yield
-    # Shutdown (if needed)
+    # Shutdown: flush queued log entries
+    await stop_log_writer(log_writer)
 
 
 def create_app() -> FastAPI:
@@ -34,10 +43,11 @@ def create_app() -> FastAPI:
         lifespan=lifespan,
     )
 
-    # Add CORS middleware
+    # Add CORS middleware; a frozenset makes the per-request origin check a
+    # hash lookup instead of a scan of the list
     app.add_middleware(
         CORSMiddleware,
-        allow_origins=settings.allowed_origins_list,
+        allow_origins=frozenset(settings.allowed_origins_list),
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
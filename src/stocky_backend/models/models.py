@@ -6,24 +6,42 @@ import uuid
 from enum import Enum
 
 from sqlalchemy import (
+    DDL,
     JSON,
     Boolean,
     Column,
     DateTime,
     Float,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
     UniqueConstraint,
+    event,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, literal_column
 
 from ..db.database import Base
 
 
+def search_document(*columns):
+    """English full-text vector over ``columns``, space-joined.
+
+    The PostgreSQL GIN search indexes are built on this exact expression, so
+    searches must use it unchanged for the planner to pick the index.
+    """
+    # Literals are inlined rather than bound: index DDL cannot bind values, and
+    # bound strings get cast in queries, which no longer matches the index
+    space, empty = literal_column("' '"), literal_column("''")
+    document = columns[0]
+    for column in columns[1:]:
+        document = document.op("||")(space).op("||")(func.coalesce(column, empty))
+    return func.to_tsvector(literal_column("'english'"), document)
+
+
 class UserRole(str, Enum):
     """User roles in the system"""
 
@@ -81,7 +99,7 @@ class Location(Base):
     __tablename__ = "locations"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(100), nullable=False, index=True)
+    name = Column(String(100), nullable=False)
     description = Column(Text, nullable=True)
     storage_type = Column(String(20), nullable=False)
     is_active = Column(Boolean, default=True)
@@ -93,6 +111,23 @@ class Location(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # INCLUDE (id) lets PostgreSQL answer name -> id probes from the index
+        # alone; SQLite indexes carry the rowid (id) already
+        Index("ix_locations_name", name, postgresql_include=["id"]),
+        Index(
+            "ix_locations_search",
+            search_document(name, description),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_locations_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     # Relationships
     created_by_user = relationship("User", back_populates="created_locations")
     skus = relationship("SKU", back_populates="location")
@@ -106,7 +141,7 @@ class Item(Base):
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False, index=True)
     description = Column(Text, nullable=True)
-    upc = Column(String(20), unique=True, index=True, nullable=True)
+    upc = Column(String(20), nullable=True)
     default_storage_type = Column(String(20), nullable=True)
     is_active = Column(Boolean, default=True)
 
@@ -124,6 +159,29 @@ class Item(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Covering for the upc -> id existence probe, as for ix_locations_name
+        Index("ix_items_upc", upc, unique=True, postgresql_include=["id"]),
+        Index(
+            "ix_items_search",
+            search_document(name, description, upc),
+            postgresql_using="gin",
+        ).ddl_if(dialect="postgresql"),
+        # Trigram indexes serve the substring (ILIKE '%q%') matches of SKU search
+        Index(
+            "ix_items_name_trgm",
+            name,
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        Index(
+            "ix_items_upc_trgm",
+            upc,
+            postgresql_using="gin",
+            postgresql_ops={"upc": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+    )
+
     # Relationships
     created_by_user = relationship("User", back_populates="created_items")
     skus = relationship("SKU", back_populates="item")
@@ -150,6 +208,13 @@ class SKU(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
+    __table_args__ = (
+        # Per-item / per-location pages filter on the FK and page by id, so
+        # both come from the index instead of a scan and sort
+        Index("ix_skus_item_id", item_id, id),
+        Index("ix_skus_location_id", location_id, id),
+    )
+
     # Relationships
     item = relationship("Item", back_populates="skus")
     location = relationship("Location", back_populates="skus")
@@ -254,7 +319,20 @@ class ShoppingListItem(Base):
     item = relationship("Item")
 
     # Constraints
-    __table_args__ = (UniqueConstraint("shopping_list_id", "item_id", name="unique_list_item"),)
+    __table_args__ = (
+        UniqueConstraint("shopping_list_id", "item_id", name="unique_list_item"),
+        # Per-list item counts only look at live rows, so the index leaves out
+        # soft-deleted ones. is_deleted is repeated as a key column because
+        # SQLite does not treat the WHERE column as covered; with it the
+        # count is answered from the index alone
+        Index(
+            "ix_shopping_list_items_active_list_id",
+            shopping_list_id,
+            is_deleted,
+            postgresql_where=~is_deleted,
+            sqlite_where=~is_deleted,
+        ),
+    )
 
 
 class ShoppingListLog(Base):
@@ -297,3 +375,11 @@ class Session(Base):
 
     # Relationships
     user = relationship("User", back_populates="sessions")
+
+
+# The trigram indexes need pg_trgm; Alembic installs it, this covers create_all
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -268,7 +268,7 @@ class ScannerStatus(BaseModel):
     scanner_id: str
     is_associated: bool
     associated_user: str | None = None
-    last_seen: datetime
+    last_seen: datetime | None = None
 
 
 class SKUQuantityUpdate(BaseModel):
@@ -423,15 +423,17 @@ class PaginatedShoppingListsResponse(BaseModel):
     """Paginated shopping lists response"""
 
     items: list[ShoppingListSummary]
-    total: int
+    total: int | None = None
     skip: int
     limit: int
+    next_cursor: int | None = None
 
 
 class PaginatedShoppingListLogsResponse(BaseModel):
     """Paginated shopping list logs response"""
 
     items: list[ShoppingListLogResponse]
-    total: int
+    total: int | None = None
     skip: int
     limit: int
+    next_cursor: int | None = None
@@ -0,0 +1,93 @@
+"""
+Batched LogEntry writer — request handlers queue log rows and a single
+background task inserts them, so no request waits on a log commit.
+"""
+
+import asyncio
+import logging
+from datetime import UTC, datetime
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from ..db.database import SessionLocal
+from ..models.models import LogEntry
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on rows written by one INSERT + commit
+LOG_BATCH_SIZE = 500
+
+_queue: asyncio.Queue | None = None
+_loop: asyncio.AbstractEventLoop | None = None
+
+
+def enqueue_log(db: Session, entry: dict) -> None:
+    """Queue a LogEntry row for the background writer.
+
+    ``created_at`` is stamped here so it records when the event happened,
+    not when the batch was flushed. Without a running writer (scripts,
+    tests that skip the app lifespan) the row is written through ``db``.
+    """
+    row = {"created_at": datetime.now(UTC), **entry}
+    if _queue is None or _loop is None:
+        db.execute(insert(LogEntry), [row])
+        db.commit()
+        return
+
+    try:
+        on_loop = asyncio.get_running_loop() is _loop
+    except RuntimeError:
+        on_loop = False
+    if on_loop:
+        _queue.put_nowait(row)
+    else:
+        _loop.call_soon_threadsafe(_queue.put_nowait, row)
+
+
+def _write_batch(rows: list[dict]) -> None:
+    db = SessionLocal()
+    try:
+        db.execute(insert(LogEntry), rows)
+        db.commit()
+    except Exception:
+        db.rollback()
+        logger.exception("Failed to write %d log entries", len(rows))
+    finally:
+        db.close()
+
+
+async def _drain(queue: asyncio.Queue) -> None:
+    while True:
+        rows = [await queue.get()]
+        # Whatever piled up while the last batch was written goes in this one
+        while len(rows) < LOG_BATCH_SIZE and not queue.empty():
+            rows.append(queue.get_nowait())
+        await run_in_threadpool(_write_batch, rows)
+
+
+async def start_log_writer() -> asyncio.Task:
+    """Start the background writer on the running event loop."""
+    global _queue, _loop
+    _queue = asyncio.Queue()
+    _loop = asyncio.get_running_loop()
+    return asyncio.create_task(_drain(_queue))
+
+
+async def stop_log_writer(task: asyncio.Task) -> None:
+    """Stop the writer and flush anything still queued."""
+    global _queue, _loop
+    queue = _queue
+    _queue = _loop = None
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+    rows = []
+    while queue is not None and not queue.empty():
+        rows.append(queue.get_nowait())
+    for start in range(0, len(rows), LOG_BATCH_SIZE):
+        await run_in_threadpool(_write_batch, rows[start : start + LOG_BATCH_SIZE])
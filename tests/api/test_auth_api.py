@@ -2,6 +2,10 @@
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import event
+
+from src.stocky_backend.core import auth as auth_module
+from src.stocky_backend.core.config import settings
 
 
 class TestAuthenticationAPI:
@@ -37,6 +41,24 @@ class TestAuthenticationAPI:
         response = await async_client.post("/api/v1/auth/login", data=login_data)
         assert response.status_code == 401
 
+    @pytest.mark.asyncio
+    async def test_login_with_nonexistent_user_runs_bcrypt(
+        self, async_client: AsyncClient, monkeypatch
+    ):
+        """Test unknown usernames still pay for a bcrypt check (no timing oracle)."""
+        calls = []
+        original = auth_module.pwd_context.verify
+
+        def counting_verify(password, hashed):
+            calls.append(password)
+            return original(password, hashed)
+
+        monkeypatch.setattr(auth_module.pwd_context, "verify", counting_verify)
+        login_data = {"username": "nonexistent", "password": "password"}
+        response = await async_client.post("/api/v1/auth/login", data=login_data)
+        assert response.status_code == 401
+        assert calls == ["password"]
+
     @pytest.mark.asyncio
     async def test_login_with_inactive_user(self, async_client: AsyncClient, inactive_user):
         """Test login failure with inactive user."""
@@ -72,6 +94,43 @@ class TestAuthenticationAPI:
         assert data["user_id"] == regular_user.id
         assert data["role"] == "member"
 
+    @pytest.mark.asyncio
+    async def test_login_loads_user_once(
+        self, async_client: AsyncClient, test_engine, regular_user
+    ):
+        """Test login doesn't reload the user after creating the session."""
+        user_selects = []
+
+        def count_user_selects(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith("SELECT") and "FROM users" in statement:
+                user_selects.append(statement)
+
+        event.listen(test_engine, "before_cursor_execute", count_user_selects)
+        try:
+            login_data = {"username": regular_user.username, "password": "testpassword123"}
+            response = await async_client.post("/api/v1/auth/login", data=login_data)
+        finally:
+            event.remove(test_engine, "before_cursor_execute", count_user_selects)
+
+        assert response.status_code == 200
+        assert len(user_selects) == 1
+
+    @pytest.mark.asyncio
+    async def test_login_rehashes_outdated_hash(
+        self, async_client: AsyncClient, db_session, regular_user, monkeypatch
+    ):
+        """Test login upgrades a hash made with an old cost factor."""
+        old_hash = regular_user.hashed_password
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS + 1)
+
+        login_data = {"username": regular_user.username, "password": "testpassword123"}
+        response = await async_client.post("/api/v1/auth/login", data=login_data)
+        assert response.status_code == 200
+
+        db_session.refresh(regular_user)
+        assert regular_user.hashed_password != old_hash
+        assert regular_user.hashed_password.split("$")[2] == f"{settings.BCRYPT_ROUNDS:02d}"
+
     @pytest.mark.asyncio
     async def test_login_sets_session_cookie(self, async_client: AsyncClient, regular_user):
         """Test that login sets the session cookie."""
@@ -123,6 +182,41 @@ class TestProtectedEndpoints:
         assert response.status_code == 401
 
 
+class TestAPIKeys:
+    """Test API key generation and use."""
+
+    @pytest.mark.asyncio
+    async def test_generated_api_key_authenticates(
+        self, async_client: AsyncClient, auth_headers_user, regular_user
+    ):
+        """Test a freshly generated API key works via the X-API-Key header."""
+        response = await async_client.post(
+            "/api/v1/auth/generate-api-key", headers=auth_headers_user
+        )
+        assert response.status_code == 200
+        api_key = response.json()["api_key"]
+
+        response = await async_client.get("/api/v1/auth/me", headers={"X-API-Key": api_key})
+        assert response.status_code == 200
+        assert response.json()["username"] == regular_user.username
+
+    @pytest.mark.asyncio
+    async def test_revoked_api_key_is_rejected(self, async_client: AsyncClient, auth_headers_user):
+        """Test a revoked API key no longer authenticates."""
+        response = await async_client.post(
+            "/api/v1/auth/generate-api-key", headers=auth_headers_user
+        )
+        api_key = response.json()["api_key"]
+
+        response = await async_client.delete(
+            "/api/v1/auth/revoke-api-key", headers=auth_headers_user
+        )
+        assert response.status_code == 200
+
+        response = await async_client.get("/api/v1/auth/me", headers={"X-API-Key": api_key})
+        assert response.status_code == 401
+
+
 class TestPasswordChange:
     """Test password change functionality."""
 
@@ -182,6 +276,45 @@ class TestRoleBasedAccess:
         data = response.json()
         assert isinstance(data, list)
 
+    @pytest.mark.asyncio
+    async def test_collection_route_without_trailing_slash(
+        self, async_client: AsyncClient, auth_headers_admin
+    ):
+        """Test collection routes answer without the trailing slash instead of redirecting."""
+        response = await async_client.get("/api/v1/users", headers=auth_headers_admin)
+        assert response.status_code == 200
+        assert isinstance(response.json(), list)
+
+    @pytest.mark.asyncio
+    async def test_metrics_admin_only(
+        self, async_client: AsyncClient, auth_headers_admin, auth_headers_user
+    ):
+        """Test the pool metrics endpoint is admin-only."""
+        response = await async_client.get("/api/v1/metrics", headers=auth_headers_admin)
+        assert response.status_code == 200
+        assert "db_pool" in response.json()
+
+        response = await async_client.get("/api/v1/metrics", headers=auth_headers_user)
+        assert response.status_code == 403
+
+    @pytest.mark.asyncio
+    async def test_scanner_status_reports_last_scan(
+        self, async_client: AsyncClient, auth_headers_user
+    ):
+        """Test scanner status reports the last recorded scan, not the current time."""
+        response = await async_client.get("/api/v1/scanner/status/s1", headers=auth_headers_user)
+        assert response.status_code == 200
+        assert response.json()["last_seen"] is None
+
+        scan = {"upc": '{"command": "set_mode", "payload": {"mode": "lookup"}}', "scanner_id": "s1"}
+        response = await async_client.post(
+            "/api/v1/scanner/scan", json=scan, headers=auth_headers_user
+        )
+        assert response.status_code == 200
+
+        response = await async_client.get("/api/v1/scanner/status/s1", headers=auth_headers_user)
+        assert response.json()["last_seen"] is not None
+
     @pytest.mark.asyncio
     async def test_user_denied_access_to_admin_endpoint(
         self, async_client: AsyncClient, auth_headers_user
@@ -30,6 +30,26 @@ class TestBackupAPI:
         assert "stocky_backup_" in response.headers["content-disposition"]
         assert ".json.gz" in response.headers["content-disposition"]
 
+    @pytest.mark.asyncio
+    async def test_download_backup_content(
+        self, async_client: AsyncClient, auth_headers_admin, db_session
+    ):
+        """Test the streamed backup decompresses to the restorable document."""
+        db_session.add(
+            UserFactory.create(
+                username="backup_test", email="backup@test.com", role=UserRole.MEMBER
+            )
+        )
+        db_session.commit()
+
+        response = await async_client.get("/api/v1/backup/download", headers=auth_headers_admin)
+        assert response.status_code == 200
+
+        backup = json.loads(gzip.decompress(response.content))
+        assert "users" in backup["metadata"]["tables"]
+        usernames = {row["username"] for row in backup["data"]["users"]}
+        assert "backup_test" in usernames
+
     @pytest.mark.asyncio
     async def test_download_backup_regular_user_denied(
         self, async_client: AsyncClient, auth_headers_user
@@ -138,6 +158,34 @@ class TestBackupAPI:
         assert response.status_code == 400
         assert "Invalid backup" in response.json()["detail"]
 
+    @pytest.mark.asyncio
+    async def test_restore_rejects_invalid_column_names(
+        self, async_client: AsyncClient, auth_headers_admin
+    ):
+        """Test restore refuses column names that aren't plain identifiers."""
+        backup_data = {"data": {"locations": [{"name) VALUES (1); DROP TABLE users; --": "x"}]}}
+        file = io.BytesIO(gzip.compress(json.dumps(backup_data).encode("utf-8")))
+        response = await async_client.post(
+            "/api/v1/backup/restore?mode=merge",
+            files={"file": ("backup.json.gz", file, "application/gzip")},
+            headers=auth_headers_admin,
+        )
+        assert response.status_code == 400
+        assert "Invalid column name" in response.json()["detail"]
+
+    @pytest.mark.asyncio
+    async def test_restore_truncated_gzip(self, async_client: AsyncClient, auth_headers_admin):
+        """Test restore rejects a backup cut off mid-stream."""
+        compressed = gzip.compress(json.dumps({"data": {"users": []}}).encode("utf-8"))
+        file = io.BytesIO(compressed[:-8])
+        response = await async_client.post(
+            "/api/v1/backup/restore?mode=merge",
+            files={"file": ("backup.json.gz", file, "application/gzip")},
+            headers=auth_headers_admin,
+        )
+        assert response.status_code == 400
+        assert "Invalid backup" in response.json()["detail"]
+
     @pytest.mark.asyncio
     async def test_status(self, async_client: AsyncClient, auth_headers_admin, db_session):
         """Test backup status returns table counts."""
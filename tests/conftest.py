@@ -10,6 +10,9 @@ import tempfile
 from collections.abc import AsyncGenerator
 from unittest.mock import Mock
 
+# Minimum bcrypt cost keeps password hashing from dominating test runtime
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
@@ -17,6 +20,7 @@ from sqlalchemy import create_engine, event
 from sqlalchemy.engine import Engine
 from sqlalchemy.orm import sessionmaker
 
+from src.stocky_backend.core.cache import page_cache, user_cache
 from src.stocky_backend.core.config import settings
 from src.stocky_backend.crud.crud import session as session_crud
 from src.stocky_backend.db.database import Base, get_db
@@ -360,3 +364,6 @@ def cleanup_after_test():
     yield
     # Clear any dependency overrides
     app.dependency_overrides.clear()
+    # Each test's rows are rolled back, so pages cached from them are stale
+    page_cache.invalidate()
+    user_cache.clear()
@@ -1,11 +1,24 @@
 """Integration tests for database operations."""
 
+import asyncio
+
 import pytest
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 
+from src.stocky_backend.core.cache import page_cache, user_cache
 from src.stocky_backend.crud import crud
-from src.stocky_backend.models.models import UserRole
-from src.stocky_backend.schemas.schemas import UserCreate, UserUpdate
+from src.stocky_backend.models.models import (
+    SKU,
+    Item,
+    Location,
+    LogEntry,
+    ShoppingList,
+    User,
+    UserRole,
+)
+from src.stocky_backend.schemas.schemas import ShoppingListItemCreate, UserCreate, UserUpdate
+from src.stocky_backend.services import log_writer
 from tests.factories.user_factory import UserFactory
 
 
@@ -161,6 +174,45 @@ class TestUserCRUDIntegration:
 
         assert verify_password("wrong_password", created_user.hashed_password) is False
 
+    def test_get_conflicts_integration(self, db_session: Session):
+        """Test username/email availability is reported per field in one lookup."""
+        # Given
+        alice = UserFactory.create(username="alice", email="alice@example.com")
+        bob = UserFactory.create(username="bob", email="bob@example.com")
+        db_session.add_all([alice, bob])
+        db_session.commit()
+
+        # When / Then
+        assert crud.user.get_conflicts(db_session, username="alice", email="bob@example.com") == {
+            "username",
+            "email",
+        }
+        assert crud.user.get_conflicts(db_session, email="alice@example.com") == {"email"}
+        assert crud.user.get_conflicts(db_session, username="carol", email="c@example.com") == set()
+        assert (
+            crud.user.get_conflicts(
+                db_session, username="alice", email="alice@example.com", exclude_id=alice.id
+            )
+            == set()
+        )
+
+    def test_get_multi_load_only_integration(self, db_session: Session):
+        """Test get_multi can limit the columns it loads."""
+        # Given
+        user = UserFactory.create(username="listed", email="listed@example.com")
+        db_session.add(user)
+        db_session.commit()
+        user_id = user.id
+        db_session.expunge_all()
+
+        # When
+        users = crud.user.get_multi(db_session, columns=(User.id, User.username))
+
+        # Then
+        listed = next(u for u in users if u.id == user_id)
+        assert listed.username == "listed"
+        assert "hashed_password" in inspect(listed).unloaded
+
 
 class TestUserConstraintsIntegration:
     """Test database constraints and validations."""
@@ -284,3 +336,151 @@ class TestUserActivationIntegration:
         # Verify user is inactive in DB
         db_user = crud.user.get(db=db_session, id=created_user.id)
         assert db_user.is_active is False
+
+
+class TestLogWriterIntegration:
+    """Test queued LogEntry writes."""
+
+    def test_enqueue_without_writer_writes_through_session(self, db_session: Session):
+        """Without a running writer the entry is committed through the given session."""
+        log_writer.enqueue_log(
+            db_session, {"level": "INFO", "message": "direct", "module": "tests"}
+        )
+
+        entry = db_session.query(LogEntry).filter(LogEntry.message == "direct").one()
+        assert entry.created_at is not None
+
+    async def test_writer_batches_queued_entries(self, monkeypatch):
+        """Entries queued together are written in one batch, and flushed on stop."""
+        batches = []
+        monkeypatch.setattr(log_writer, "_write_batch", batches.append)
+
+        task = await log_writer.start_log_writer()
+        for n in range(3):
+            log_writer.enqueue_log(None, {"level": "INFO", "message": f"queued {n}"})
+        await asyncio.sleep(0.05)
+        log_writer.enqueue_log(None, {"level": "INFO", "message": "at shutdown"})
+        await log_writer.stop_log_writer(task)
+
+        assert [[row["message"] for row in batch] for batch in batches] == [
+            ["queued 0", "queued 1", "queued 2"],
+            ["at shutdown"],
+        ]
+
+
+class TestCreateIfUniqueIntegration:
+    """Integration tests for single-statement unique inserts"""
+
+    def test_duplicate_value_is_not_inserted(self, db_session: Session, admin_user):
+        data = {"name": "Pantry", "storage_type": "pantry", "created_by": admin_user.id}
+        created = crud.location.create_if_unique(db_session, obj_in=data, unique_field="name")
+        assert created is not None and created.is_active
+
+        duplicate = crud.location.create_if_unique(db_session, obj_in=data, unique_field="name")
+        assert duplicate is None
+        assert db_session.query(Location).filter(Location.name == "Pantry").count() == 1
+
+
+class TestShoppingListAddItemIntegration:
+    """Integration tests for adding items to shopping lists with one upsert"""
+
+    def test_add_rejects_live_duplicate_and_restores_deleted(self, db_session: Session, admin_user):
+        item = Item(name="Oats", created_by=admin_user.id)
+        shopping_list = ShoppingList(name="Weekly", is_public=True, creator_id=admin_user.id)
+        db_session.add_all([item, shopping_list])
+        db_session.commit()
+
+        data = ShoppingListItemCreate(item_id=item.id, quantity=2)
+        added = crud.shopping_list.add_item(db_session, shopping_list, data, admin_user)
+        with pytest.raises(ValueError):
+            crud.shopping_list.add_item(db_session, shopping_list, data, admin_user)
+
+        crud.shopping_list.remove_item(db_session, added, admin_user)
+        data = ShoppingListItemCreate(item_id=item.id, quantity=5)
+        restored = crud.shopping_list.add_item(db_session, shopping_list, data, admin_user)
+        assert restored.id == added.id
+        assert (restored.quantity, restored.is_deleted) == (5, False)
+
+
+class TestSearchIntegration:
+    """Integration tests for CRUD search loading"""
+
+    def test_sku_search_populates_item_and_location(self, db_session: Session, admin_user):
+        item = Item(name="Oat Milk", upc="99887766", created_by=admin_user.id)
+        location = Location(name="Fridge", storage_type="refrigerator", created_by=admin_user.id)
+        db_session.add(SKU(item=item, location=location, quantity=2, created_by=admin_user.id))
+        db_session.commit()
+        db_session.expunge_all()
+
+        statements = []
+        engine = db_session.get_bind().engine
+
+        def listener(conn, cursor, statement, *args):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", listener)
+        try:
+            (sku,) = crud.sku.search(db_session, query="oat")
+            assert (sku.item.name, sku.location.name) == ("Oat Milk", "Fridge")
+        finally:
+            event.remove(engine, "before_cursor_execute", listener)
+        assert len(statements) == 1
+
+
+class TestPageCacheIntegration:
+    """Test list page cache invalidation on commit."""
+
+    def test_committed_write_invalidates_table_pages(self, db_session: Session, admin_user):
+        """A committed Item write stops cached item pages from being served."""
+        key = page_cache.key("items", 0, 100)
+        page_cache.set(key, b"[]")
+        assert page_cache.get(key) == b"[]"
+
+        db_session.add(Item(name="Milk", created_by=admin_user.id))
+        db_session.commit()
+
+        assert page_cache.get(key) is None
+        assert page_cache.key("items", 0, 100) != key
+
+    def test_rolled_back_write_keeps_pages(self, db_session: Session, admin_user):
+        """A write that is rolled back leaves cached pages in place."""
+        key = page_cache.key("items", 0, 100)
+        page_cache.set(key, b"[]")
+
+        db_session.add(Item(name="Milk", created_by=admin_user.id))
+        db_session.flush()
+        db_session.rollback()
+
+        assert page_cache.get(key) == b"[]"
+
+    def test_other_tables_keep_pages(self, db_session: Session, admin_user):
+        """Writes to one table leave another table's pages cached."""
+        key = page_cache.key("locations", 0, 100)
+        page_cache.set(key, b"[]")
+
+        db_session.add(Item(name="Milk", created_by=admin_user.id))
+        db_session.commit()
+
+        assert page_cache.get(key) == b"[]"
+
+
+class TestUserCacheIntegration:
+    """Test the authenticated-user cache."""
+
+    def test_hit_skips_load_until_user_write(self, db_session: Session, admin_user):
+        """A cached user is served without loading until a users write commits."""
+        loads = []
+
+        def load():
+            loads.append(1)
+            return db_session.get(User, admin_user.id)
+
+        key = user_cache.key("session", "token")
+        assert user_cache.lookup(db_session, key, load).id == admin_user.id
+        assert user_cache.lookup(db_session, key, load).username == admin_user.username
+        assert len(loads) == 1
+
+        admin_user.email = "renamed@test.com"
+        db_session.commit()
+        user_cache.lookup(db_session, key, load)
+        assert len(loads) == 2
@@ -1,9 +1,14 @@
 """Unit tests for authentication functionality."""
 
+from src.stocky_backend.api.endpoints.auth import warm_up_response_models
+from src.stocky_backend.core import auth as auth_module
 from src.stocky_backend.core.auth import (
     get_password_hash,
+    password_needs_rehash,
     verify_password,
 )
+from src.stocky_backend.core.config import settings
+from src.stocky_backend.core.security import require_user_role
 from src.stocky_backend.crud.crud import session as session_crud
 from tests.factories.user_factory import UserFactory
 
@@ -28,6 +33,43 @@ class TestPasswordSecurity:
         assert verify_password(password, hash1) is True
         assert verify_password(password, hash2) is True
 
+    def test_hash_uses_configured_rounds(self):
+        """Test that new hashes use the BCRYPT_ROUNDS cost factor."""
+        hashed = get_password_hash("test_password_123")
+        assert hashed.split("$")[2] == f"{settings.BCRYPT_ROUNDS:02d}"
+
+    def test_needs_rehash_on_cost_mismatch(self, monkeypatch):
+        """Test hashes made with a different cost are flagged for rehash."""
+        hashed = get_password_hash("test_password_123")
+        assert password_needs_rehash(hashed) is False
+        monkeypatch.setattr(settings, "BCRYPT_ROUNDS", settings.BCRYPT_ROUNDS + 1)
+        assert password_needs_rehash(hashed) is True
+
+    def test_scrypt_hash_and_verify(self, monkeypatch):
+        """Test scrypt hashes verify and record their cost."""
+        monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "scrypt")
+        monkeypatch.setattr(settings, "SCRYPT_COST", 10)
+        hashed = get_password_hash("test_password_123")
+        assert hashed.startswith("$scrypt$ln=10,")
+        assert verify_password("test_password_123", hashed) is True
+        assert verify_password("wrong_password", hashed) is False
+        assert password_needs_rehash(hashed) is False
+        monkeypatch.setattr(settings, "SCRYPT_COST", 11)
+        assert password_needs_rehash(hashed) is True
+
+    def test_scheme_change_verifies_old_hashes_and_flags_rehash(self, monkeypatch):
+        """Test bcrypt hashes still verify after switching to scrypt, and vice versa."""
+        bcrypt_hash = get_password_hash("test_password_123")
+        monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "scrypt")
+        monkeypatch.setattr(settings, "SCRYPT_COST", 10)
+        assert auth_module.pwd_context.verify("test_password_123", bcrypt_hash) is True
+        assert password_needs_rehash(bcrypt_hash) is True
+
+        scrypt_hash = get_password_hash("test_password_123")
+        monkeypatch.setattr(settings, "PASSWORD_HASH_SCHEME", "bcrypt")
+        assert auth_module.pwd_context.verify("test_password_123", scrypt_hash) is True
+        assert password_needs_rehash(scrypt_hash) is True
+
     def test_empty_password_handling(self):
         """Test handling of empty passwords."""
         empty_password = ""
@@ -104,6 +146,24 @@ class TestSessionManagement:
         assert session_crud.get_user_by_token(db_session, token1) is None
         assert session_crud.get_user_by_token(db_session, token2) is None
 
+    def test_cleanup_expired(self, db_session, monkeypatch):
+        """Test cleanup deletes only sessions past their expiry."""
+        user = UserFactory.create(
+            username="cleanupuser",
+            email="cleanup@test.com",
+            is_active=True,
+        )
+        db_session.add(user)
+        db_session.commit()
+
+        live_token = session_crud.create(db_session, user_id=user.id)
+        monkeypatch.setattr(settings, "SESSION_EXPIRE_HOURS", -1)
+        session_crud.create(db_session, user_id=user.id)
+
+        assert session_crud.cleanup_expired(db_session) == 1
+        assert session_crud.cleanup_expired(db_session) == 0
+        assert session_crud.get_user_by_token(db_session, live_token) is not None
+
     def test_inactive_user_session(self, db_session):
         """Test sessions for inactive users still resolve (security layer checks is_active)."""
         user = UserFactory.create(
@@ -122,3 +182,60 @@ class TestSessionManagement:
         found_user = session_crud.get_user_by_token(db_session, raw_token)
         assert found_user is not None
         assert found_user.id == user.id
+
+
+class TestVerifyPasswordCache:
+    """Test caching of successful password verifications."""
+
+    def _count_bcrypt_calls(self, monkeypatch):
+        calls = []
+        original = auth_module.pwd_context.verify
+
+        def counting_verify(password, hashed):
+            calls.append(password)
+            return original(password, hashed)
+
+        monkeypatch.setattr(auth_module.pwd_context, "verify", counting_verify)
+        return calls
+
+    def test_successful_verify_is_cached(self, monkeypatch):
+        """Repeat verification of a correct password skips bcrypt."""
+        hashed = get_password_hash("cached_password")
+        calls = self._count_bcrypt_calls(monkeypatch)
+        assert verify_password("cached_password", hashed) is True
+        assert verify_password("cached_password", hashed) is True
+        assert len(calls) == 1
+
+    def test_failed_verify_is_not_cached(self, monkeypatch):
+        """Wrong passwords always pay the full bcrypt cost."""
+        hashed = get_password_hash("cached_password")
+        calls = self._count_bcrypt_calls(monkeypatch)
+        assert verify_password("wrong_password", hashed) is False
+        assert verify_password("wrong_password", hashed) is False
+        assert len(calls) == 2
+
+    def test_cache_can_be_disabled(self, monkeypatch):
+        """With the cache disabled every call goes to bcrypt."""
+        monkeypatch.setattr(settings, "AUTH_VERIFY_CACHE_ENABLED", False)
+        hashed = get_password_hash("cached_password")
+        calls = self._count_bcrypt_calls(monkeypatch)
+        assert verify_password("cached_password", hashed) is True
+        assert verify_password("cached_password", hashed) is True
+        assert len(calls) == 2
+
+
+class TestResponseModelWarmup:
+    """Test the startup warmup of auth response models."""
+
+    def test_warm_up_response_models(self):
+        """Warmup dummy data stays valid as the response schemas evolve."""
+        warm_up_response_models()
+
+
+class TestRoleDependencies:
+    """Test role dependency factories."""
+
+    def test_require_user_role_is_shared_per_role(self):
+        """Test routes asking for the same role get the same dependency callable."""
+        assert require_user_role("manager") is require_user_role("manager")
+        assert require_user_role("manager") is not require_user_role("admin")
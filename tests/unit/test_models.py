@@ -3,9 +3,12 @@
 from datetime import datetime
 
 import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.schema import CreateIndex
 
-from src.stocky_backend.models.models import Item, Location, User, UserRole
+from src.stocky_backend.models.models import Item, Location, User, UserRole, search_document
 from tests.factories.user_factory import UserFactory
 
 
@@ -179,6 +182,16 @@ class TestUserModel:
         assert user.is_active is True  # Default from factory
         assert user.hashed_password is not None
 
+    @pytest.mark.parametrize("column", ["username", "api_key"])
+    def test_auth_lookup_uses_index(self, db_session, column):
+        """Login and API-key lookups use an index rather than scanning users."""
+        plan = db_session.execute(
+            text(f"EXPLAIN QUERY PLAN SELECT * FROM users WHERE {column} = :value"),
+            {"value": "x"},
+        ).all()
+        detail = " ".join(row[-1] for row in plan)
+        assert f"USING INDEX ix_users_{column}" in detail
+
 
 class TestUserModelValidation:
     """Test User model validation and constraints."""
@@ -330,6 +343,35 @@ class TestItemModel:
         assert item.default_storage_type == "PANTRY"
         assert item.is_active is False
 
+    def test_search_query_matches_search_index_expression(self):
+        """Test the search expression compiles to the GIN index expression on PostgreSQL."""
+        dialect = postgresql.dialect()
+        index = next(ix for ix in Item.__table__.indexes if ix.name == "ix_items_search")
+        index_ddl = str(CreateIndex(index).compile(dialect=dialect))
+
+        vector = search_document(Item.name, Item.description, Item.upc)
+        query_sql = str(vector.compile(dialect=dialect)).replace("items.", "")
+
+        assert query_sql in index_ddl
+
+    @pytest.mark.parametrize(
+        ("table", "column", "index"),
+        [("items", "upc", "ix_items_upc"), ("locations", "name", "ix_locations_name")],
+    )
+    def test_existence_probe_is_index_only(self, db_session, table, column, index):
+        """Duplicate UPC/name probes are answered from the index without reading rows."""
+        plan = db_session.execute(
+            text(f"EXPLAIN QUERY PLAN SELECT id FROM {table} WHERE {column} = :value LIMIT 1"),
+            {"value": "x"},
+        ).all()
+        detail = " ".join(row[-1] for row in plan)
+        assert f"USING COVERING INDEX {index}" in detail
+
+    def test_search_index_skipped_on_sqlite(self, db_session):
+        """Test the PostgreSQL-only search index is not created on SQLite."""
+        indexes = db_session.execute(text("PRAGMA index_list(items)")).all()
+        assert "ix_items_search" not in {row[1] for row in indexes}
+
 
 class TestLocationModel:
     """Test Location model functionality."""
@@ -393,6 +435,40 @@ class TestLocationModel:
         assert location1.name == location2.name
 
 
+class TestSKUModel:
+    """Test SKU model functionality."""
+
+    @pytest.mark.parametrize("column", ["item_id", "location_id"])
+    def test_pages_by_parent_use_index_order(self, db_session, column):
+        """Per-item/location SKU pages are read in id order from the index, with no sort."""
+        plan = db_session.execute(
+            text(
+                f"EXPLAIN QUERY PLAN SELECT * FROM skus WHERE {column} = :value"
+                " AND id > :after ORDER BY id LIMIT 10"
+            ),
+            {"value": 1, "after": 0},
+        ).all()
+        detail = " ".join(row[-1] for row in plan)
+        assert f"USING INDEX ix_skus_{column}" in detail
+        assert "TEMP B-TREE" not in detail
+
+
+class TestShoppingListItemModel:
+    """Test ShoppingListItem model functionality."""
+
+    def test_active_item_count_is_index_only(self, db_session):
+        """Per-list counts of live items are answered from the partial index."""
+        plan = db_session.execute(
+            text(
+                "EXPLAIN QUERY PLAN SELECT count(*) FROM shopping_list_items"
+                " WHERE shopping_list_id = :list_id AND is_deleted = 0"
+            ),
+            {"list_id": 1},
+        ).all()
+        detail = " ".join(row[-1] for row in plan)
+        assert "USING COVERING INDEX ix_shopping_list_items_active_list_id" in detail
+
+
 class TestModelRelationships:
     """Test model relationships and foreign keys."""
 